@@ -4,48 +4,67 @@ Torna SDK 发布脚本 - 正式 PyPI 版本
 用于发布正式版本到 PyPI 仓库
 """
 
+import io
 import os
 import sys
 import subprocess
-import shutil
-import getpass
 from pathlib import Path
 
 
 class ProductionPublisher:
     """正式 PyPI 发布器"""
     
+    # 验证发布失败后的重试间隔（秒）
+    VERIFY_RETRY_DELAYS = (2, 5, 10, 30)
+    
     def __init__(self):
         self.sdk_dir = Path(__file__).parent.parent / "torna-sdk"
         self.dist_dir = self.sdk_dir / "dist"
         self.package_name = "torna-sdk"
+        self._log = io.StringIO()
+    
+    def log(self, message: str = "", end: str = "\n"):
+        """写入日志缓冲区，由 flush_log 统一输出"""
+        self._log.write(message)
+        self._log.write(end)
+    
+    def flush_log(self):
+        """一次性输出缓冲区中的日志"""
+        output = self._log.getvalue()
+        if output:
+            sys.stdout.write(output)
+            sys.stdout.flush()
+        self._log.seek(0)
+        self._log.truncate()
         
     def check_dependencies(self):
         """检查构建依赖"""
-        print("🔍 检查构建依赖...")
+        self.log("🔍 检查构建依赖...")
         
         required_packages = ["build", "twine"]
         missing_packages = []
         
         for package in required_packages:
             try:
-                subprocess.run([sys.executable, "-m", package, "--help"], 
-                             capture_output=True, check=True)
-                print(f"  ✅ {package} 已安装")
+                subprocess.run([sys.executable, "-m", package, "--help"],
+                               stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL,
+                               check=True)
+                self.log(f"  ✅ {package} 已安装")
             except subprocess.CalledProcessError:
                 missing_packages.append(package)
-                print(f"  ❌ {package} 未安装")
+                self.log(f"  ❌ {package} 未安装")
         
         if missing_packages:
-            print(f"\n⚠️  缺少依赖: {', '.join(missing_packages)}")
-            print("请运行: pip install " + " ".join(missing_packages))
+            self.log(f"\n⚠️  缺少依赖: {', '.join(missing_packages)}")
+            self.log("请运行: pip install " + " ".join(missing_packages))
             return False
         
         return True
     
     def check_environment(self):
         """检查发布环境"""
-        print("🔍 检查发布环境...")
+        self.log("🔍 检查发布环境...")
         
         # 检查包版本
         pyproject_file = self.sdk_dir / "pyproject.toml"
@@ -53,37 +72,40 @@ class ProductionPublisher:
             with open(pyproject_file, 'r', encoding='utf-8') as f:
                 content = f.read()
                 if 'version = "0.1.0"' in content:
-                    print("  ⚠️  版本号仍然是 0.1.0，建议更新到正式版本号")
-                    print("  💡 请更新 pyproject.toml 中的 version 为更高版本")
+                    self.log("  ⚠️  版本号仍然是 0.1.0，建议更新到正式版本号")
+                    self.log("  💡 请更新 pyproject.toml 中的 version 为更高版本")
                     return False
                 else:
-                    print("  ✅ 版本号已更新")
+                    self.log("  ✅ 版本号已更新")
         else:
-            print("  ❌ 找不到 pyproject.toml 文件")
+            self.log("  ❌ 找不到 pyproject.toml 文件")
             return False
         
         # 检查 README 文件
         readme_file = self.sdk_dir / "README.md"
         if readme_file.exists():
-            print("  ✅ README.md 存在")
+            self.log("  ✅ README.md 存在")
         else:
-            print("  ⚠️  README.md 不存在")
+            self.log("  ⚠️  README.md 不存在")
         
         return True
     
     def clean_dist(self):
         """清理旧的构建文件"""
-        print("🧹 清理构建目录...")
+        self.log("🧹 清理构建目录...")
         
         if self.dist_dir.exists():
+            import shutil
+            
             shutil.rmtree(self.dist_dir)
-            print("  ✅ 已清理 dist 目录")
+            self.log("  ✅ 已清理 dist 目录")
         else:
-            print("  ℹ️  dist 目录不存在，无需清理")
+            self.log("  ℹ️  dist 目录不存在，无需清理")
     
     def build_package(self):
         """构建包"""
-        print("🔨 构建包...")
+        self.log("🔨 构建包...")
+        self.flush_log()  # 先输出阶段标题，再进入耗时的子进程
         
         os.chdir(self.sdk_dir)
         
@@ -93,22 +115,22 @@ class ProductionPublisher:
                 sys.executable, "-m", "build"
             ], check=True, capture_output=True, text=True)
             
-            print("  ✅ 包构建成功")
+            self.log("  ✅ 包构建成功")
             
             # 显示生成的文件
             if self.dist_dir.exists():
                 files = list(self.dist_dir.glob("*"))
-                print(f"  📦 生成的文件 ({len(files)} 个):")
+                self.log(f"  📦 生成的文件 ({len(files)} 个):")
                 for file in files:
                     size = file.stat().st_size
-                    print(f"    - {file.name} ({size:,} bytes)")
+                    self.log(f"    - {file.name} ({size:,} bytes)")
             
             return True
             
         except subprocess.CalledProcessError as e:
-            print(f"  ❌ 构建失败: {e}")
+            self.log(f"  ❌ 构建失败: {e}")
             if e.stderr:
-                print(f"错误输出: {e.stderr}")
+                self.log(f"错误输出: {e.stderr}")
             return False
     
     def get_pypi_token(self):
@@ -118,19 +140,22 @@ class ProductionPublisher:
             token = os.getenv("PYPI_PASSWORD")  # 兼容老版本
         
         if not token:
-            print("  ⚠️  未找到 PYPI_TOKEN 环境变量")
-            print("  📝 请设置: export PYPI_TOKEN='pypi-xxxxxx_token_here_xxxxxx'")
+            self.log("  ⚠️  未找到 PYPI_TOKEN 环境变量")
+            self.log("  📝 请设置: export PYPI_TOKEN='pypi-xxxxxx_token_here_xxxxxx'")
+            self.flush_log()
+            import getpass
             token = getpass.getpass("或者输入 PyPI Token: ")
         
         return token.strip()
     
     def upload_to_pypi(self):
         """上传到正式 PyPI"""
-        print("🚀 上传到 PyPI...")
+        self.log("🚀 上传到 PyPI...")
+        self.flush_log()  # 先输出阶段标题，再进入耗时的子进程
         
         token = self.get_pypi_token()
         if not token:
-            print("  ❌ 未提供有效的 token")
+            self.log("  ❌ 未提供有效的 token")
             return False
         
         try:
@@ -143,7 +168,7 @@ class ProductionPublisher:
                 str(self.dist_dir / "*")
             ], check=True, capture_output=True, text=True)
             
-            print("  ✅ 上传成功")
+            self.log("  ✅ 上传成功")
             
             # 提取 URL 信息
             output = result.stdout
@@ -151,66 +176,82 @@ class ProductionPublisher:
                 url_line = [line for line in output.split('\n') if "View at:" in line]
                 if url_line:
                     url = url_line[0].split("View at:")[-1].strip()
-                    print(f"  🔗 包页面: {url}")
+                    self.log(f"  🔗 包页面: {url}")
             
             return True
             
         except subprocess.CalledProcessError as e:
-            print(f"  ❌ 上传失败: {e}")
+            self.log(f"  ❌ 上传失败: {e}")
             if e.stderr:
-                print(f"错误输出: {e.stderr}")
+                self.log(f"错误输出: {e.stderr}")
             
             # 检查是否是重复版本错误
             if "already exists" in str(e.stderr) or "already exists" in str(e.stdout):
-                print("  💡 可能是版本号已存在，请检查版本号")
+                self.log("  💡 可能是版本号已存在，请检查版本号")
             
             return False
     
     def verify_publication(self):
-        """验证发布"""
-        print("🔍 验证发布...")
+        """验证发布（PyPI 索引同步有延迟，失败时按退避间隔重试）"""
+        self.log("🔍 验证发布...")
         
         try:
+            import time
+            import urllib.error
             import urllib.request
             import json
             
             # 检查包是否存在
             url = f"https://pypi.org/pypi/{self.package_name}/json"
-            with urllib.request.urlopen(url) as response:
-                data = json.loads(response.read().decode())
+            last_error = None
+            for attempt, delay in enumerate((0,) + self.VERIFY_RETRY_DELAYS):
+                if delay:
+                    self.log(f"  ⏳ {delay} 秒后重试 ({attempt}/{len(self.VERIFY_RETRY_DELAYS)})...")
+                    self.flush_log()
+                    time.sleep(delay)
+                
+                try:
+                    with urllib.request.urlopen(url) as response:
+                        data = json.loads(response.read().decode())
+                except urllib.error.URLError as e:
+                    last_error = e
+                    continue
                 
                 version = data["info"]["version"]
-                print(f"  ✅ 包存在，版本: {version}")
+                self.log(f"  ✅ 包存在，版本: {version}")
                 
                 # 检查文件
                 files = data["urls"]
-                print(f"  📁 可用文件: {len(files)} 个")
+                self.log(f"  📁 可用文件: {len(files)} 个")
                 for file_info in files:
-                    print(f"    - {file_info['filename']} ({file_info['size']:,} bytes)")
+                    self.log(f"    - {file_info['filename']} ({file_info['size']:,} bytes)")
                 
                 return True
+            
+            self.log(f"  ❌ 验证失败: {last_error}")
+            return False
                 
         except Exception as e:
-            print(f"  ❌ 验证失败: {e}")
+            self.log(f"  ❌ 验证失败: {e}")
             return False
     
     def show_production_guide(self):
         """显示生产环境使用指南"""
-        print("\n📋 生产环境使用指南:")
-        print("=" * 50)
+        self.log("\n📋 生产环境使用指南:")
+        self.log("=" * 50)
         
-        print("1️⃣  从 PyPI 安装:")
-        print("   pip install torna-sdk")
+        self.log("1️⃣  从 PyPI 安装:")
+        self.log("   pip install torna-sdk")
         
-        print("\n2️⃣  测试安装:")
-        print("   python3 -c \"from torna_sdk import TornaClient; print('✅ 成功!')\"")
+        self.log("\n2️⃣  测试安装:")
+        self.log("   python3 -c \"from torna_sdk import TornaClient; print('✅ 成功!')\"")
         
-        print("\n3️⃣  项目集成:")
-        print("   # requirements.txt")
-        print("   torna-sdk>=1.0.0")
+        self.log("\n3️⃣  项目集成:")
+        self.log("   # requirements.txt")
+        self.log("   torna-sdk>=1.0.0")
         
-        print("\n4️⃣  使用示例:")
-        print("""
+        self.log("\n4️⃣  使用示例:")
+        self.log("""
    from torna_sdk import TornaClient, DocListRequest
    
    with TornaClient("https://api.example.com", "production-token") as client:
@@ -220,14 +261,22 @@ class ProductionPublisher:
     
     def run(self):
         """运行完整的发布流程"""
-        print("🚀 Torna SDK 发布到 PyPI (生产环境)")
-        print("=" * 50)
+        try:
+            return self._run_phases()
+        finally:
+            self.flush_log()
+    
+    def _run_phases(self):
+        """按阶段执行发布流程，每个阶段结束时统一输出日志"""
+        self.log("🚀 Torna SDK 发布到 PyPI (生产环境)")
+        self.log("=" * 50)
         
         # 显示当前配置
-        print(f"📦 包名: {self.package_name}")
-        print(f"📁 SDK目录: {self.sdk_dir}")
-        print(f"🔧 Python: {sys.executable}")
-        print()
+        self.log(f"📦 包名: {self.package_name}")
+        self.log(f"📁 SDK目录: {self.sdk_dir}")
+        self.log(f"🔧 Python: {sys.executable}")
+        self.log()
+        self.flush_log()
         
         # 检查环境和依赖
         if not self.check_environment():
@@ -235,35 +284,40 @@ class ProductionPublisher:
         
         if not self.check_dependencies():
             return False
+        self.flush_log()
         
         # 清理构建目录
         self.clean_dist()
+        self.flush_log()
         
         # 构建包
         if not self.build_package():
             return False
         
         # 显示构建结果并确认
-        print("\n📦 构建完成，准备发布到生产环境")
-        print("⚠️  这将发布到正式的 PyPI 仓库，影响所有用户")
-        print("\n❓ 确认发布到 PyPI 生产环境? (yes/no): ", end="")
+        self.log("\n📦 构建完成，准备发布到生产环境")
+        self.log("⚠️  这将发布到正式的 PyPI 仓库，影响所有用户")
+        self.log("\n❓ 确认发布到 PyPI 生产环境? (yes/no): ", end="")
+        self.flush_log()
         response = input().strip().lower()
         if response != 'yes':
-            print("发布已取消")
+            self.log("发布已取消")
             return False
         
         # 上传到 PyPI
         if not self.upload_to_pypi():
             return False
+        self.flush_log()
         
         # 验证发布
         if not self.verify_publication():
-            print("⚠️  验证失败，但可能需要几分钟才能同步")
+            self.log("⚠️  验证失败，但可能需要几分钟才能同步")
+        self.flush_log()
         
         # 显示使用指南
         self.show_production_guide()
         
-        print("\n🎉 正式版本发布完成！")
+        self.log("\n🎉 正式版本发布完成！")
         return True
 
 
@@ -4,57 +4,80 @@ Torna SDK 发布脚本 - Test PyPI 版本
 用于发布测试版本到 Test PyPI 仓库
 """
 
+import io
 import os
 import sys
 import subprocess
-import shutil
 from pathlib import Path
 
 
 class TestPublisher:
     """Test PyPI 发布器"""
     
+    # 验证发布失败后的重试间隔（秒）
+    VERIFY_RETRY_DELAYS = (2, 5, 10, 30)
+    
     def __init__(self):
         self.sdk_dir = Path(__file__).parent.parent / "torna-sdk"
         self.dist_dir = self.sdk_dir / "dist"
         self.package_name = "torna-sdk"
+        self._log = io.StringIO()
+    
+    def log(self, message: str = "", end: str = "\n"):
+        """写入日志缓冲区，由 flush_log 统一输出"""
+        self._log.write(message)
+        self._log.write(end)
+    
+    def flush_log(self):
+        """一次性输出缓冲区中的日志"""
+        output = self._log.getvalue()
+        if output:
+            sys.stdout.write(output)
+            sys.stdout.flush()
+        self._log.seek(0)
+        self._log.truncate()
         
     def check_dependencies(self):
         """检查构建依赖"""
-        print("🔍 检查构建依赖...")
+        self.log("🔍 检查构建依赖...")
         
         required_packages = ["build", "twine"]
         missing_packages = []
         
         for package in required_packages:
             try:
-                subprocess.run([sys.executable, "-m", package, "--help"], 
-                             capture_output=True, check=True)
-                print(f"  ✅ {package} 已安装")
+                subprocess.run([sys.executable, "-m", package, "--help"],
+                               stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL,
+                               check=True)
+                self.log(f"  ✅ {package} 已安装")
             except subprocess.CalledProcessError:
                 missing_packages.append(package)
-                print(f"  ❌ {package} 未安装")
+                self.log(f"  ❌ {package} 未安装")
         
         if missing_packages:
-            print(f"\n⚠️  缺少依赖: {', '.join(missing_packages)}")
-            print("请运行: pip install " + " ".join(missing_packages))
+            self.log(f"\n⚠️  缺少依赖: {', '.join(missing_packages)}")
+            self.log("请运行: pip install " + " ".join(missing_packages))
             return False
         
         return True
     
     def clean_dist(self):
         """清理旧的构建文件"""
-        print("🧹 清理构建目录...")
+        self.log("🧹 清理构建目录...")
         
         if self.dist_dir.exists():
+            import shutil
+            
             shutil.rmtree(self.dist_dir)
-            print("  ✅ 已清理 dist 目录")
+            self.log("  ✅ 已清理 dist 目录")
         else:
-            print("  ℹ️  dist 目录不存在，无需清理")
+            self.log("  ℹ️  dist 目录不存在，无需清理")
     
     def build_package(self):
         """构建包"""
-        print("🔨 构建包...")
+        self.log("🔨 构建包...")
+        self.flush_log()  # 先输出阶段标题，再进入耗时的子进程
         
         os.chdir(self.sdk_dir)
         
@@ -64,33 +87,34 @@ class TestPublisher:
                 sys.executable, "-m", "build"
             ], check=True, capture_output=True, text=True)
             
-            print("  ✅ 包构建成功")
+            self.log("  ✅ 包构建成功")
             
             # 显示生成的文件
             if self.dist_dir.exists():
                 files = list(self.dist_dir.glob("*"))
-                print(f"  📦 生成的文件 ({len(files)} 个):")
+                self.log(f"  📦 生成的文件 ({len(files)} 个):")
                 for file in files:
                     size = file.stat().st_size
-                    print(f"    - {file.name} ({size:,} bytes)")
+                    self.log(f"    - {file.name} ({size:,} bytes)")
             
             return True
             
         except subprocess.CalledProcessError as e:
-            print(f"  ❌ 构建失败: {e}")
+            self.log(f"  ❌ 构建失败: {e}")
             if e.stderr:
-                print(f"错误输出: {e.stderr}")
+                self.log(f"错误输出: {e.stderr}")
             return False
     
     def upload_to_testpypi(self):
         """上传到 Test PyPI"""
-        print("🚀 上传到 Test PyPI...")
+        self.log("🚀 上传到 Test PyPI...")
+        self.flush_log()  # 先输出阶段标题，再进入耗时的子进程
         
         # API Token 从环境变量获取
         token = os.getenv("TEST_PYPI_TOKEN")
         if not token:
-            print("  ⚠️  未找到 TEST_PYPI_TOKEN 环境变量")
-            print("  📝 请设置: export TEST_PYPI_TOKEN='your-token'")
+            self.log("  ⚠️  未找到 TEST_PYPI_TOKEN 环境变量")
+            self.log("  📝 请设置: export TEST_PYPI_TOKEN='your-token'")
             return False
         
         try:
@@ -103,7 +127,7 @@ class TestPublisher:
                 str(self.dist_dir / "*")
             ], check=True, capture_output=True, text=True)
             
-            print("  ✅ 上传成功")
+            self.log("  ✅ 上传成功")
             
             # 提取 URL 信息
             output = result.stdout
@@ -111,57 +135,73 @@ class TestPublisher:
                 url_line = [line for line in output.split('\n') if "View at:" in line]
                 if url_line:
                     url = url_line[0].split("View at:")[-1].strip()
-                    print(f"  🔗 包页面: {url}")
+                    self.log(f"  🔗 包页面: {url}")
             
             return True
             
         except subprocess.CalledProcessError as e:
-            print(f"  ❌ 上传失败: {e}")
+            self.log(f"  ❌ 上传失败: {e}")
             if e.stderr:
-                print(f"错误输出: {e.stderr}")
+                self.log(f"错误输出: {e.stderr}")
             return False
     
     def verify_publication(self):
-        """验证发布"""
-        print("🔍 验证发布...")
+        """验证发布（PyPI 索引同步有延迟，失败时按退避间隔重试）"""
+        self.log("🔍 验证发布...")
         
         try:
+            import time
+            import urllib.error
             import urllib.request
             import json
             
             # 检查包是否存在
             url = f"https://test.pypi.org/pypi/{self.package_name}/json"
-            with urllib.request.urlopen(url) as response:
-                data = json.loads(response.read().decode())
+            last_error = None
+            for attempt, delay in enumerate((0,) + self.VERIFY_RETRY_DELAYS):
+                if delay:
+                    self.log(f"  ⏳ {delay} 秒后重试 ({attempt}/{len(self.VERIFY_RETRY_DELAYS)})...")
+                    self.flush_log()
+                    time.sleep(delay)
+                
+                try:
+                    with urllib.request.urlopen(url) as response:
+                        data = json.loads(response.read().decode())
+                except urllib.error.URLError as e:
+                    last_error = e
+                    continue
                 
                 version = data["info"]["version"]
-                print(f"  ✅ 包存在，版本: {version}")
+                self.log(f"  ✅ 包存在，版本: {version}")
                 
                 # 检查文件
                 files = data["urls"]
-                print(f"  📁 可用文件: {len(files)} 个")
+                self.log(f"  📁 可用文件: {len(files)} 个")
                 for file_info in files:
-                    print(f"    - {file_info['filename']} ({file_info['size']:,} bytes)")
+                    self.log(f"    - {file_info['filename']} ({file_info['size']:,} bytes)")
                 
                 return True
+            
+            self.log(f"  ❌ 验证失败: {last_error}")
+            return False
                 
         except Exception as e:
-            print(f"  ❌ 验证失败: {e}")
+            self.log(f"  ❌ 验证失败: {e}")
             return False
     
     def show_installation_guide(self):
         """显示安装指南"""
-        print("\n📋 安装和使用指南:")
-        print("=" * 50)
+        self.log("\n📋 安装和使用指南:")
+        self.log("=" * 50)
         
-        print("1️⃣  从 Test PyPI 安装:")
-        print("   pip install -i https://test.pypi.org/simple/ torna-sdk==0.1.0")
+        self.log("1️⃣  从 Test PyPI 安装:")
+        self.log("   pip install -i https://test.pypi.org/simple/ torna-sdk==0.1.0")
         
-        print("\n2️⃣  测试安装:")
-        print("   python3 -c \"from torna_sdk import TornaClient; print('✅ 成功!')\"")
+        self.log("\n2️⃣  测试安装:")
+        self.log("   python3 -c \"from torna_sdk import TornaClient; print('✅ 成功!')\"")
         
-        print("\n3️⃣  使用示例:")
-        print("""
+        self.log("\n3️⃣  使用示例:")
+        self.log("""
    from torna_sdk import TornaClient, DocListRequest
    
    with TornaClient("http://localhost:7700", "your-token") as client:
@@ -171,45 +211,58 @@ class TestPublisher:
     
     def run(self):
         """运行完整的发布流程"""
-        print("🚀 Torna SDK 发布到 Test PyPI")
-        print("=" * 50)
+        try:
+            return self._run_phases()
+        finally:
+            self.flush_log()
+    
+    def _run_phases(self):
+        """按阶段执行发布流程，每个阶段结束时统一输出日志"""
+        self.log("🚀 Torna SDK 发布到 Test PyPI")
+        self.log("=" * 50)
         
         # 显示当前配置
-        print(f"📦 包名: {self.package_name}")
-        print(f"📁 SDK目录: {self.sdk_dir}")
-        print(f"🔧 Python: {sys.executable}")
-        print()
+        self.log(f"📦 包名: {self.package_name}")
+        self.log(f"📁 SDK目录: {self.sdk_dir}")
+        self.log(f"🔧 Python: {sys.executable}")
+        self.log()
+        self.flush_log()
         
         # 检查依赖
         if not self.check_dependencies():
             return False
+        self.flush_log()
         
         # 清理构建目录
         self.clean_dist()
+        self.flush_log()
         
         # 构建包
         if not self.build_package():
             return False
         
         # 确认发布
-        print("\n❓ 确认发布到 Test PyPI? (y/N): ", end="")
+        self.log("\n❓ 确认发布到 Test PyPI? (y/N): ", end="")
+        self.flush_log()
         response = input().strip().lower()
         if response not in ['y', 'yes']:
-            print("发布已取消")
+            self.log("发布已取消")
             return False
         
         # 上传到 Test PyPI
         if not self.upload_to_testpypi():
             return False
+        self.flush_log()
         
         # 验证发布
         if not self.verify_publication():
-            print("⚠️  验证失败，但可能需要几分钟才能同步")
+            self.log("⚠️  验证失败，但可能需要几分钟才能同步")
+        self.flush_log()
         
         # 显示安装指南
         self.show_installation_guide()
         
-        print("\n🎉 Test PyPI 发布完成！")
+        self.log("\n🎉 Test PyPI 发布完成！")
         return True
 
 
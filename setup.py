@@ -26,6 +26,12 @@ setup(
         "pydantic>=2.0.0",
         "fastmcp>=0.3.0",
     ],
+    extras_require={
+        "test": [
+            "pytest>=7.0",
+            "pytest-xdist>=3.0",
+        ],
+    },
     python_requires=">=3.11",
     classifiers=[
         "Development Status :: 4 - Beta",
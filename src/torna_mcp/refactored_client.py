@@ -3,14 +3,33 @@
 Torna 客户端 - 参考 Java SDK 重新设计
 """
 
+import asyncio
+import atexit
+import copy
+import importlib.util
 import json
 import os
+import re
+import time
 import urllib.parse
-from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Type, TypeVar, Generic
+from collections import OrderedDict
+from typing import Any, ClassVar, Dict, List, Optional, Tuple, Type, TypeVar, Generic, get_origin
 import httpx
 
+# JSON 编解码 - 优先使用 orjson (可选依赖)，缺失时回退到标准库
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    _loads = json.loads
+
 # 类型变量定义
 T = TypeVar('T', bound='BaseResponse')
 
@@ -27,22 +46,44 @@ class TornaConfig:
     TIMESTAMP_PATTERN = "%Y-%m-%d %H:%M:%S"
     ACCESS_TOKEN_NAME = "access_token"
     LOCALE = "zh-CN"
-    CONNECT_TIMEOUT = 60
-    READ_TIMEOUT = 60
+    CONNECT_TIMEOUT = 5
+    READ_TIMEOUT = 30
+    WRITE_TIMEOUT = 10
+    # 等待连接池空闲连接的超时，过载时快速失败而不是排队
+    POOL_TIMEOUT = 1
+    # get_document 缓存的最大文档数，超出时淘汰最久未使用的文档
+    DOC_CACHE_SIZE = 1024
 
 
 class TornaAPIError(Exception):
-    """API 错误异常类"""
+    """API 错误异常类
+    
+    HTTP 错误时仅保存原始响应，响应体在首次访问 message 时才解码拼接，
+    只检查 code 的调用方无需为 (可能很大的) 错误页面付出解码开销。
+    """
     
-    def __init__(self, code: str, message: str):
+    def __init__(self, code: str, message: str, response: Optional[httpx.Response] = None):
         self.code = code
-        self.message = message
-        super().__init__(f"Torna API Error {code}: {message}")
+        self.response = response
+        self._message = message
+        super().__init__(code, message)
+    
+    @property
+    def message(self) -> str:
+        """错误信息 (含 HTTP 响应体时按需解码)"""
+        if self.response is not None:
+            return f"{self._message} - {self.response.text}"
+        return self._message
+    
+    def __str__(self) -> str:
+        return f"Torna API Error {self.code}: {self.message}"
 
 
-class BaseResponse(ABC):
+class BaseResponse:
     """响应基类 - 参考 Java SDK 的 BaseResponse"""
     
+    __slots__ = ("code", "msg", "data")
+    
     def __init__(self):
         self.code: Optional[str] = None
         self.msg: Optional[str] = None
@@ -54,13 +95,19 @@ class BaseResponse(ABC):
     
     @classmethod
     def from_dict(cls: Type[T], data: Dict[str, Any]) -> T:
-        """从字典创建响应对象"""
-        response = cls()
-        response.code = data.get("code")
-        response.msg = data.get("msg")
-        response.data = data.get("data")
+        """从字典创建响应对象 (跳过 __init__ 的默认赋值，一次解包写入三个字段)"""
+        response = cls.__new__(cls)
+        response.code, response.msg, response.data = data.get("code"), data.get("msg"), data.get("data")
         return response
     
+    @classmethod
+    def parse(cls: Type[T], content: bytes) -> T:
+        """从原始响应内容 (UTF-8 字节串或字符串) 解析响应对象"""
+        try:
+            return cls.from_dict(_loads(content))
+        except (json.JSONDecodeError, UnicodeDecodeError, TypeError) as e:
+            raise TornaAPIError("PARSE_ERROR", f"响应解析失败: {e}")
+    
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
         return {
@@ -70,212 +117,215 @@ class BaseResponse(ABC):
         }
 
 
-class DocListResponse(BaseResponse):
+D = TypeVar('D')
+
+
+class Response(BaseResponse, Generic[D]):
+    """通用响应类 - 各接口的响应仅 data 类型不同，由类型参数 D 表示"""
+    
+    __slots__ = ()
+    
+    data: Optional[D]
+
+
+# 各接口的响应类 - 均为参数化 Response 的空子类，保留各自的名称，支持 isinstance 检查且互不相同
+class DocListResponse(Response[List[Dict[str, Any]]]):
     """文档列表响应类"""
     
-    def __init__(self):
-        super().__init__()
-        self.data: Optional[List[Dict[str, Any]]] = None
+    __slots__ = ()
 
 
-class DocGetResponse(BaseResponse):
+class DocGetResponse(Response[Dict[str, Any]]):
     """文档详情响应类"""
     
-    def __init__(self):
-        super().__init__()
-        self.data: Optional[Dict[str, Any]] = None
+    __slots__ = ()
 
 
-class DocPushResponse(BaseResponse):
+class DocPushResponse(Response[List[Dict[str, Any]]]):
     """文档推送响应类"""
     
-    def __init__(self):
-        super().__init__()
-        self.data: Optional[List[Dict[str, Any]]] = None
+    __slots__ = ()
 
 
-class ModuleGetResponse(BaseResponse):
+class ModuleGetResponse(Response[Dict[str, Any]]):
     """模块信息响应类"""
     
-    def __init__(self):
-        super().__init__()
-        self.data: Optional[Dict[str, Any]] = None
+    __slots__ = ()
 
 
-class DocDetailsResponse(BaseResponse):
+class DocDetailsResponse(Response[List[Dict[str, Any]]]):
     """批量文档详情响应类"""
     
-    def __init__(self):
-        super().__init__()
-        self.data: Optional[List[Dict[str, Any]]] = None
+    __slots__ = ()
 
 
-class DocCategoryCreateResponse(BaseResponse):
+class DocCategoryCreateResponse(Response[Dict[str, Any]]):
     """创建分类响应类"""
     
-    def __init__(self):
-        super().__init__()
-        self.data: Optional[Dict[str, Any]] = None
+    __slots__ = ()
 
 
-class DocCategoryListResponse(BaseResponse):
+class DocCategoryListResponse(Response[List[Dict[str, Any]]]):
     """分类列表响应类"""
     
-    def __init__(self):
-        super().__init__()
-        self.data: Optional[List[Dict[str, Any]]] = None
+    __slots__ = ()
 
 
-class DocCategoryNameUpdateResponse(BaseResponse):
+class DocCategoryNameUpdateResponse(Response[Dict[str, Any]]):
     """更新分类名称响应类"""
     
-    def __init__(self):
-        super().__init__()
-        self.data: Optional[Dict[str, Any]] = None
+    __slots__ = ()
 
 
-class EnumPushResponse(BaseResponse):
+class EnumPushResponse(Response[Dict[str, Any]]):
     """枚举推送响应类"""
     
-    def __init__(self):
-        super().__init__()
-        self.data: Optional[Dict[str, Any]] = None
+    __slots__ = ()
 
 
-class ModuleDebugEnvSetResponse(BaseResponse):
+class ModuleDebugEnvSetResponse(Response[Dict[str, Any]]):
     """设置调试环境响应类"""
     
-    def __init__(self):
-        super().__init__()
-        self.data: Optional[Dict[str, Any]] = None
+    __slots__ = ()
 
 
-class ModuleDebugEnvDeleteResponse(BaseResponse):
+class ModuleDebugEnvDeleteResponse(Response[Dict[str, Any]]):
     """删除调试环境响应类"""
     
-    def __init__(self):
-        super().__init__()
-        self.data: Optional[Dict[str, Any]] = None
+    __slots__ = ()
 
 
 class RequestForm:
-    """请求表单类 - 参考 Java SDK 的 RequestForm"""
+    """请求表单类 - 参考 Java SDK 的 RequestForm
+    
+    表单直接持有传入的字典而不做拷贝，构建完成后调用方不应再修改该字典。
+    """
+    
+    __slots__ = ("form",)
     
     def __init__(self, form_data: Dict[str, Any]):
-        self.form: Dict[str, Any] = form_data.copy()
+        self.form: Dict[str, Any] = form_data
     
     def get_form(self) -> Dict[str, Any]:
-        """获取表单数据"""
-        return self.form.copy()
+        """获取表单数据 (只读，请勿修改返回的字典)"""
+        return self.form
+
+
+# 无参数接口 (doc.list、module.get 等) 的请求数据及其预先编码结果
+_EMPTY_JSON = b"{}"
+_EMPTY_ENCODED = urllib.parse.quote_from_bytes(_EMPTY_JSON, safe='')
+
+# 最近一次格式化的时间戳 (秒, 字符串)，同一秒内的请求复用同一结果
+_cached_timestamp: Tuple[int, str] = (-1, "")
 
 
-class BaseRequest(ABC, Generic[T]):
+def _now_timestamp() -> str:
+    """当前时间戳字符串，按秒缓存格式化结果"""
+    global _cached_timestamp
+    now = int(time.time())
+    if now != _cached_timestamp[0]:
+        _cached_timestamp = (now, time.strftime(TornaConfig.TIMESTAMP_PATTERN, time.localtime(now)))
+    return _cached_timestamp[1]
+
+
+class BaseRequest(Generic[T]):
     """请求基类 - 参考 Java SDK 的 BaseRequest"""
     
-    def __init__(self, token: str, response_class: Type[T]):
-        self.token = token
-        self.response_class: Type[T] = response_class
+    __slots__ = ("token",)
     
-    @abstractmethod
-    def name(self) -> str:
-        """接口名称"""
-        pass
+    # 接口名称与版本，由子类以类属性声明
+    name: ClassVar[str]
+    version: ClassVar[str]
+    # 响应类在类定义时确定 (class XxxRequest(BaseRequest[...], response_class=...))，默认为通用 Response
+    response_class: ClassVar[Type[BaseResponse]] = Response
     
-    @abstractmethod
-    def version(self) -> str:
-        """接口版本"""
-        pass
+    def __init_subclass__(cls, response_class: Optional[Type[BaseResponse]] = None, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        if response_class is not None:
+            # 参数化别名 (如 Response[Dict[str, Any]]) 解析为其原始类，避免每次解析都经过别名转发
+            cls.response_class = get_origin(response_class) or response_class
+    
+    def __init__(self, token: str):
+        self.token = token
     
     def create_request_form(self) -> RequestForm:
         """创建请求表单 - 模板方法"""
         data = self.build_json_data()
+        encoded = _EMPTY_ENCODED if data is _EMPTY_JSON else self._url_encode(data)
         
         # 构建公共参数
         param = {
-            TornaConfig.API_NAME: self.name(),
-            TornaConfig.DATA_NAME: self._url_encode(data),
-            TornaConfig.VERSION_NAME: self.version(),
-            TornaConfig.TIMESTAMP_NAME: datetime.now().strftime(TornaConfig.TIMESTAMP_PATTERN),
+            TornaConfig.API_NAME: self.name,
+            TornaConfig.DATA_NAME: encoded,
+            TornaConfig.VERSION_NAME: self.version,
+            TornaConfig.TIMESTAMP_NAME: _now_timestamp(),
             TornaConfig.ACCESS_TOKEN_NAME: self.token,
         }
         
         return RequestForm(param)
     
-    def build_json_data(self) -> str:
-        """构建 JSON 数据"""
+    def build_json_data(self) -> bytes:
+        """构建 JSON 数据 (UTF-8 字节串)"""
         # 子类可以重写此方法来添加特定参数
-        return "{}"
+        return _EMPTY_JSON
     
-    def parse_response(self, response_text: str) -> T:
-        """解析响应"""
-        try:
-            response_data = json.loads(response_text)
-            return self.response_class.from_dict(response_data)
-        except (json.JSONDecodeError, TypeError) as e:
-            raise TornaAPIError("PARSE_ERROR", f"响应解析失败: {e}")
+    def parse_response(self, response_content: bytes) -> T:
+        """解析响应 (接受 UTF-8 字节串或字符串)"""
+        return self.response_class.parse(response_content)
     
-    def _url_encode(self, data: str) -> str:
-        """URL 编码"""
-        return urllib.parse.quote(data, safe='')
+    def _url_encode(self, data: bytes) -> str:
+        """URL 编码 - 直接对 UTF-8 字节编码，避免再次 encode"""
+        return urllib.parse.quote_from_bytes(data, safe='')
 
 
-class DocListRequest(BaseRequest[DocListResponse]):
+class DocListRequest(BaseRequest[DocListResponse], response_class=DocListResponse):
     """文档列表请求类 - 参考 Java SDK 的 DocListRequest"""
     
-    def __init__(self, token: str):
-        super().__init__(token, DocListResponse)
-    
-    def name(self) -> str:
-        return "doc.list"
-    
-    def version(self) -> str:
-        return "1.0"
+    __slots__ = ()
+    name = "doc.list"
+    version = "1.0"
     
     def create_request_form(self) -> RequestForm:
         """doc.list 不需要额外参数，返回空对象"""
         return super().create_request_form()
 
 
-class DocGetRequest(BaseRequest[DocGetResponse]):
+class DocGetRequest(BaseRequest[DocGetResponse], response_class=DocGetResponse):
     """文档详情请求类"""
     
+    __slots__ = ("doc_id",)
+    name = "doc.detail"
+    version = "1.0"
+    
     def __init__(self, token: str, doc_id: str):
-        super().__init__(token, DocGetResponse)
+        super().__init__(token)
         self.doc_id = doc_id
     
-    def name(self) -> str:
-        return "doc.detail"
-    
-    def version(self) -> str:
-        return "1.0"
-    
-    def build_json_data(self) -> str:
+    def build_json_data(self) -> bytes:
         """构建包含文档ID的JSON数据"""
-        return json.dumps({"id": self.doc_id})
+        return _dumps({"id": self.doc_id})
 
 
-class DocPushRequest(BaseRequest[DocPushResponse]):
+class DocPushRequest(BaseRequest[DocPushResponse], response_class=DocPushResponse):
     """文档推送请求类"""
     
+    __slots__ = ("apis", "debug_envs")
+    name = "doc.push"
+    version = "1.0"
+    
     def __init__(self, token: str):
-        super().__init__(token, DocPushResponse)
+        super().__init__(token)
         self.apis: Optional[List[Dict[str, Any]]] = None
         self.debug_envs: Optional[List[Dict[str, Any]]] = None
     
-    def name(self) -> str:
-        return "doc.push"
-    
-    def version(self) -> str:
-        return "1.0"
-    
-    def build_json_data(self) -> str:
+    def build_json_data(self) -> bytes:
         """构建推送数据的JSON"""
         data = {}
         if self.apis:
             data["apis"] = self.apis
         if self.debug_envs:
             data["debugEnvs"] = self.debug_envs
-        return json.dumps(data, ensure_ascii=False)
+        return _dumps(data)
     
     def set_apis(self, apis: List[Dict[str, Any]]) -> 'DocPushRequest':
         """设置API列表"""
@@ -288,60 +338,110 @@ class DocPushRequest(BaseRequest[DocPushResponse]):
         return self
 
 
-class ModuleGetRequest(BaseRequest[ModuleGetResponse]):
+class ModuleGetRequest(BaseRequest[ModuleGetResponse], response_class=ModuleGetResponse):
     """模块信息请求类"""
     
-    def __init__(self, token: str):
-        super().__init__(token, ModuleGetResponse)
-    
-    def name(self) -> str:
-        return "module.get"
-    
-    def version(self) -> str:
-        return "1.0"
+    __slots__ = ()
+    name = "module.get"
+    version = "1.0"
 
 
-class DocDetailsRequest(BaseRequest[DocDetailsResponse]):
+class DocDetailsRequest(BaseRequest[DocDetailsResponse], response_class=DocDetailsResponse):
     """批量文档详情请求类"""
     
+    __slots__ = ("doc_ids",)
+    name = "doc.details"
+    version = "1.0"
+    
     def __init__(self, token: str, doc_ids: List[str]):
-        super().__init__(token, DocDetailsResponse)
+        super().__init__(token)
         self.doc_ids = doc_ids
     
-    def name(self) -> str:
-        return "doc.details"
-    
-    def version(self) -> str:
-        return "1.0"
-    
-    def build_json_data(self) -> str:
+    def build_json_data(self) -> bytes:
         """构建文档ID列表的JSON"""
-        return json.dumps({"ids": self.doc_ids})
+        return _dumps({"ids": self.doc_ids})
+
+
+# HTTP/2 需要可选依赖 h2 (pip install httpx[http2])，未安装时使用 HTTP/1.1 keep-alive
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# 进程内共享的 HTTP 客户端，所有 TornaClient 实例复用同一个连接池
+_SHARED_CLIENT: Optional[httpx.Client] = None
+
+
+def _client_options() -> Dict[str, Any]:
+    """同步/异步 HTTP 客户端共用的连接配置
+
+    连接数需覆盖 refactored_server.BATCH_DOC_CONCURRENCY 的并发批量请求；等待空闲连接超过
+    POOL_TIMEOUT 即失败，过载时不排队。
+    """
+    return {
+        "http2": _HTTP2_AVAILABLE,
+        "timeout": httpx.Timeout(
+            connect=TornaConfig.CONNECT_TIMEOUT,
+            read=TornaConfig.READ_TIMEOUT,
+            write=TornaConfig.WRITE_TIMEOUT,
+            pool=TornaConfig.POOL_TIMEOUT,
+        ),
+        "limits": httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=30.0),
+    }
+
+
+# 匹配 URL 中完整的 /api 路径段 (以 /api 结尾或包含 /api/)
+_API_PATH_RE = re.compile(r'/api(?:/|$)')
+
+
+def _normalize_base_url(base_url: str) -> str:
+    """处理基础URL，确保以 /api 结尾"""
+    base_url = base_url.rstrip('/')
+    # 如果URL中已经有/api路径，则不重复添加
+    if not _API_PATH_RE.search(base_url):
+        base_url = base_url + '/api'
+    return base_url
+
+
+def _get_shared_client() -> httpx.Client:
+    """获取共享的 HTTP 客户端，首次调用或已关闭时创建"""
+    global _SHARED_CLIENT
+    if _SHARED_CLIENT is None or _SHARED_CLIENT.is_closed:
+        _SHARED_CLIENT = httpx.Client(**_client_options())
+    return _SHARED_CLIENT
+
+
+def close_shared_client() -> None:
+    """关闭共享的 HTTP 客户端 (进程退出时自动调用)"""
+    global _SHARED_CLIENT
+    if _SHARED_CLIENT is not None:
+        _SHARED_CLIENT.close()
+        _SHARED_CLIENT = None
+
+
+atexit.register(close_shared_client)
 
 
 class TornaClient:
     """Torna 客户端类 - 参考 Java SDK 的 OpenClient"""
     
     def __init__(self, base_url: str, token: str):
-        # 处理基础URL，确保正确格式
-        base_url = base_url.rstrip('/')
-        # 如果URL中已经有/api路径，则不重复添加
-        # 使用更精确的匹配：检查是否有/api路径而不是简单包含
-        if not base_url.endswith('/api') and '/api/' not in base_url:
-            base_url = base_url + '/api'
-        self.base_url = base_url
+        self.base_url = _normalize_base_url(base_url)
         self.token = token
         self.client: Optional[httpx.Client] = None
+        # 请求头固定不变，创建客户端时构建一次
+        self._headers: Dict[str, str] = {
+            "Accept-Language": TornaConfig.LOCALE,
+            "Content-Type": "application/json"
+        }
+        # get_document 的 LRU 缓存 (doc_id -> 文档详情)，推送文档后清空
+        self._doc_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
     
     def __enter__(self):
-        """上下文管理器入口"""
-        self.client = httpx.Client(timeout=60.0)
+        """上下文管理器入口 - 复用共享连接池"""
+        self.client = _get_shared_client()
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """上下文管理器出口"""
-        if self.client:
-            self.client.close()
+        """上下文管理器出口 - 仅释放引用，连接池保持存活供后续请求复用"""
+        self.client = None
     
     def execute(self, request: BaseRequest) -> BaseResponse:
         """执行请求 - 核心方法"""
@@ -351,59 +451,62 @@ class TornaClient:
         # 创建请求表单
         request_form = request.create_request_form()
         
-        # 构建请求头
-        headers = self._build_headers()
-        
         try:
             # 发送HTTP请求
+            # 表单直接序列化为 JSON 字节发送，避免 httpx 再用标准库 json 编码一遍
             response = self.client.post(
                 self.base_url,
-                json=request_form.get_form(),
-                headers=headers,
-                timeout=60.0
+                content=_dumps(request_form.get_form()),
+                headers=self._headers
             )
             response.raise_for_status()
             
-            # 解析响应
-            response_text = response.text
-            return request.parse_response(response_text)
+            # 解析响应 - 直接解析原始字节，省去 bytes -> str 解码
+            return request.parse_response(response.content)
             
         except httpx.HTTPStatusError as e:
-            raise TornaAPIError("HTTP_ERROR", f"HTTP请求失败: {e.response.status_code} - {e.response.text}")
+            raise TornaAPIError("HTTP_ERROR", f"HTTP请求失败: {e.response.status_code}", e.response)
         except httpx.TimeoutException as e:
             raise TornaAPIError("TIMEOUT_ERROR", f"请求超时: {e}")
         except Exception as e:
             raise TornaAPIError("UNKNOWN_ERROR", f"未知错误: {e}")
     
-    def _build_headers(self) -> Dict[str, str]:
-        """构建请求头"""
-        return {
-            "Accept-Language": TornaConfig.LOCALE,
-            "Content-Type": "application/json"
-        }
-    
     # 便捷方法
     def get_documents(self) -> List[Dict[str, Any]]:
         """获取文档列表"""
         request = DocListRequest(self.token)
         response = self.execute(request)
-        if not response.is_success():
+        if response.code != TornaConfig.SUCCESS_CODE:
             raise TornaAPIError(response.code or "UNKNOWN", response.msg or "获取文档失败")
         return response.data or []
     
     def get_document(self, doc_id: str) -> Dict[str, Any]:
-        """获取单个文档详情"""
+        """获取单个文档详情
+        
+        同一客户端实例内对相同 doc_id 的重复调用直接返回缓存结果 (最多缓存 TornaConfig.DOC_CACHE_SIZE 个文档，
+        按最近使用淘汰)，调用 push_document / push_documents 后缓存会被清空。
+        返回的是缓存内容的深拷贝，调用方修改结果不会影响之后的读取。
+        """
+        cached = self._doc_cache.get(doc_id)
+        if cached is not None:
+            self._doc_cache.move_to_end(doc_id)
+            return copy.deepcopy(cached)
         request = DocGetRequest(self.token, doc_id)
         response = self.execute(request)
-        if not response.is_success():
+        if response.code != TornaConfig.SUCCESS_CODE:
             raise TornaAPIError(response.code or "UNKNOWN", response.msg or f"获取文档 {doc_id} 失败")
-        return response.data
+        if response.data is None:
+            return None
+        self._doc_cache[doc_id] = response.data
+        if len(self._doc_cache) > TornaConfig.DOC_CACHE_SIZE:
+            self._doc_cache.popitem(last=False)
+        return copy.deepcopy(response.data)
     
     def get_module_info(self) -> Dict[str, Any]:
         """获取模块信息"""
         request = ModuleGetRequest(self.token)
         response = self.execute(request)
-        if not response.is_success():
+        if response.code != TornaConfig.SUCCESS_CODE:
             raise TornaAPIError(response.code or "UNKNOWN", response.msg or "获取模块信息失败")
         return response.data
     
@@ -411,8 +514,9 @@ class TornaClient:
         """推送单个文档"""
         request = DocPushRequest(self.token)
         request.set_apis([doc_config])
+        self._doc_cache.clear()
         response = self.execute(request)
-        if not response.is_success():
+        if response.code != TornaConfig.SUCCESS_CODE:
             raise TornaAPIError(response.code or "UNKNOWN", response.msg or "推送文档失败")
         return response.data or []
     
@@ -422,8 +526,9 @@ class TornaClient:
         request.set_apis(docs)
         if debug_envs:
             request.set_debug_envs(debug_envs)
+        self._doc_cache.clear()
         response = self.execute(request)
-        if not response.is_success():
+        if response.code != TornaConfig.SUCCESS_CODE:
             raise TornaAPIError(response.code or "UNKNOWN", response.msg or "批量推送文档失败")
         return response.data or []
     
@@ -431,7 +536,193 @@ class TornaClient:
         """批量获取文档详情"""
         request = DocDetailsRequest(self.token, doc_ids)
         response = self.execute(request)
-        if not response.is_success():
+        if response.code != TornaConfig.SUCCESS_CODE:
+            raise TornaAPIError(response.code or "UNKNOWN", response.msg or "批量获取文档失败")
+        return response.data or []
+
+
+class _DocLoader:
+    """文档详情合并加载器 - 参考 GraphQL DataLoader
+    
+    在一个短时间窗口内收集并发的 get_document 调用，窗口结束后合并为一次
+    doc.details 请求，再按文档 id 将结果分发给各个等待者。
+    """
+    
+    def __init__(self, client: "AsyncTornaClient", delay: float = 0.005):
+        self._client = client
+        self._delay = delay
+        self._pending: Dict[str, List["asyncio.Future[Dict[str, Any]]"]] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # 定时器和等待中的 Future 都属于创建它们的事件循环
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: set = set()
+    
+    def load(self, doc_id: str) -> "asyncio.Future[Dict[str, Any]]":
+        """登记一个待加载的文档，返回在合并请求完成后得到结果的 Future"""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # 换了事件循环（如多次 asyncio.run）：旧循环的定时器可能永远不会触发，
+            # 丢弃旧批次，否则新的调用会一直等待
+            self._loop = loop
+            self._timer = None
+            self._pending = {}
+        future = loop.create_future()
+        self._pending.setdefault(doc_id, []).append(future)
+        if self._timer is None:
+            self._timer = loop.call_later(self._delay, self._dispatch)
+        return future
+    
+    def _dispatch(self) -> None:
+        """时间窗口结束，取出当前批次并发起请求"""
+        self._timer = None
+        pending, self._pending = self._pending, {}
+        task = asyncio.ensure_future(self._flush(pending))
+        # 保存任务引用，防止执行期间被垃圾回收
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _flush(self, pending: Dict[str, List["asyncio.Future[Dict[str, Any]]"]]) -> None:
+        """执行合并请求并分发结果"""
+        try:
+            if len(pending) == 1:
+                # 只有一个文档时直接使用 doc.detail 接口
+                doc_id = next(iter(pending))
+                docs = {doc_id: await self._client._fetch_document(doc_id)}
+            else:
+                batch = await self._client.get_batch_documents(list(pending))
+                docs = {str(doc.get("id")): doc for doc in batch if isinstance(doc, dict)}
+        except Exception as e:
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+        
+        for doc_id, futures in pending.items():
+            doc = docs.get(doc_id)
+            for future in futures:
+                if future.done():
+                    continue
+                if doc is None:
+                    future.set_exception(TornaAPIError("UNKNOWN", f"获取文档 {doc_id} 失败"))
+                else:
+                    future.set_result(doc)
+
+
+class AsyncTornaClient:
+    """异步 Torna 客户端类 - 基于 httpx.AsyncClient，多个请求可在同一事件循环中并发执行"""
+    
+    def __init__(self, base_url: str, token: str):
+        self.base_url = _normalize_base_url(base_url)
+        self.token = token
+        self.client: Optional[httpx.AsyncClient] = None
+        # 请求头固定不变，创建客户端时构建一次
+        self._headers: Dict[str, str] = {
+            "Accept-Language": TornaConfig.LOCALE,
+            "Content-Type": "application/json"
+        }
+        self._doc_loader = _DocLoader(self)
+    
+    async def __aenter__(self):
+        """异步上下文管理器入口"""
+        self.client = httpx.AsyncClient(**_client_options())
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """异步上下文管理器出口"""
+        if self.client:
+            await self.client.aclose()
+            self.client = None
+    
+    async def execute(self, request: BaseRequest) -> BaseResponse:
+        """执行请求 - 核心方法"""
+        if not self.client:
+            raise TornaAPIError("CLIENT_ERROR", "客户端未初始化，请使用 async with 语句")
+        
+        # 创建请求表单
+        request_form = request.create_request_form()
+        
+        try:
+            # 发送HTTP请求
+            # 表单直接序列化为 JSON 字节发送，避免 httpx 再用标准库 json 编码一遍
+            response = await self.client.post(
+                self.base_url,
+                content=_dumps(request_form.get_form()),
+                headers=self._headers
+            )
+            response.raise_for_status()
+            
+            # 解析响应 - 直接解析原始字节，省去 bytes -> str 解码
+            return request.parse_response(response.content)
+            
+        except httpx.HTTPStatusError as e:
+            raise TornaAPIError("HTTP_ERROR", f"HTTP请求失败: {e.response.status_code}", e.response)
+        except httpx.TimeoutException as e:
+            raise TornaAPIError("TIMEOUT_ERROR", f"请求超时: {e}")
+        except Exception as e:
+            raise TornaAPIError("UNKNOWN_ERROR", f"未知错误: {e}")
+    
+    # 便捷方法
+    async def get_documents(self) -> List[Dict[str, Any]]:
+        """获取文档列表"""
+        request = DocListRequest(self.token)
+        response = await self.execute(request)
+        if response.code != TornaConfig.SUCCESS_CODE:
+            raise TornaAPIError(response.code or "UNKNOWN", response.msg or "获取文档失败")
+        return response.data or []
+    
+    async def get_document(self, doc_id: str) -> Dict[str, Any]:
+        """获取单个文档详情
+        
+        并发发起的多个 get_document 调用会在 5ms 窗口内合并为一次 doc.details 请求。
+        """
+        return await self._doc_loader.load(doc_id)
+    
+    async def _fetch_document(self, doc_id: str) -> Dict[str, Any]:
+        """通过 doc.detail 接口获取单个文档详情"""
+        request = DocGetRequest(self.token, doc_id)
+        response = await self.execute(request)
+        if response.code != TornaConfig.SUCCESS_CODE:
+            raise TornaAPIError(response.code or "UNKNOWN", response.msg or f"获取文档 {doc_id} 失败")
+        return response.data
+    
+    async def get_documents_many(self, doc_ids: List[str]) -> List[Dict[str, Any]]:
+        """并发获取多个文档详情 (合并为一次批量请求)，结果顺序与 doc_ids 一致"""
+        return list(await asyncio.gather(*[self.get_document(doc_id) for doc_id in doc_ids]))
+    
+    async def get_module_info(self) -> Dict[str, Any]:
+        """获取模块信息"""
+        request = ModuleGetRequest(self.token)
+        response = await self.execute(request)
+        if response.code != TornaConfig.SUCCESS_CODE:
+            raise TornaAPIError(response.code or "UNKNOWN", response.msg or "获取模块信息失败")
+        return response.data
+    
+    async def push_document(self, doc_config: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """推送单个文档"""
+        request = DocPushRequest(self.token)
+        request.set_apis([doc_config])
+        response = await self.execute(request)
+        if response.code != TornaConfig.SUCCESS_CODE:
+            raise TornaAPIError(response.code or "UNKNOWN", response.msg or "推送文档失败")
+        return response.data or []
+    
+    async def push_documents(self, docs: List[Dict[str, Any]], debug_envs: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """批量推送文档"""
+        request = DocPushRequest(self.token)
+        request.set_apis(docs)
+        if debug_envs:
+            request.set_debug_envs(debug_envs)
+        response = await self.execute(request)
+        if response.code != TornaConfig.SUCCESS_CODE:
+            raise TornaAPIError(response.code or "UNKNOWN", response.msg or "批量推送文档失败")
+        return response.data or []
+    
+    async def get_batch_documents(self, doc_ids: List[str]) -> List[Dict[str, Any]]:
+        """批量获取文档详情"""
+        request = DocDetailsRequest(self.token, doc_ids)
+        response = await self.execute(request)
+        if response.code != TornaConfig.SUCCESS_CODE:
             raise TornaAPIError(response.code or "UNKNOWN", response.msg or "批量获取文档失败")
         return response.data or []
 
@@ -477,134 +768,127 @@ def example_usage():
 
 # ==================== 新增的 Request 类 - 补充 Java SDK 所有功能 ====================
 
-class DocCategoryCreateRequest(BaseRequest[DocCategoryCreateResponse]):
+class DocCategoryCreateRequest(
+    BaseRequest[DocCategoryCreateResponse], response_class=DocCategoryCreateResponse
+):
     """创建分类请求类"""
     
-    def __init__(self, token: str, name: str):
-        super().__init__(token, DocCategoryCreateResponse)
-        self.name = name
-    
-    def name(self) -> str:
-        return "doc.category.create"
+    __slots__ = ("category_name",)
+    name = "doc.category.create"
+    version = "1.0"
     
-    def version(self) -> str:
-        return "1.0"
+    def __init__(self, token: str, name: str):
+        super().__init__(token)
+        self.category_name = name
     
-    def build_json_data(self) -> str:
+    def build_json_data(self) -> bytes:
         """构建分类创建数据"""
-        return json.dumps({"name": self.name})
+        return _dumps({"name": self.category_name})
 
 
-class DocCategoryListRequest(BaseRequest[DocCategoryListResponse]):
+class DocCategoryListRequest(
+    BaseRequest[DocCategoryListResponse], response_class=DocCategoryListResponse
+):
     """分类列表请求类"""
     
-    def __init__(self, token: str):
-        super().__init__(token, DocCategoryListResponse)
-    
-    def name(self) -> str:
-        return "doc.category.list"
-    
-    def version(self) -> str:
-        return "1.0"
+    __slots__ = ()
+    name = "doc.category.list"
+    version = "1.0"
 
 
-class DocCategoryNameUpdateRequest(BaseRequest[DocCategoryNameUpdateResponse]):
+class DocCategoryNameUpdateRequest(
+    BaseRequest[DocCategoryNameUpdateResponse], response_class=DocCategoryNameUpdateResponse
+):
     """更新分类名称请求类"""
     
+    __slots__ = ("category_id", "category_name")
+    name = "doc.category.name.update"
+    version = "1.0"
+    
     def __init__(self, token: str, category_id: str, name: str):
-        super().__init__(token, DocCategoryNameUpdateResponse)
+        super().__init__(token)
         self.category_id = category_id
-        self.name = name
-    
-    def name(self) -> str:
-        return "doc.category.name.update"
+        self.category_name = name
     
-    def version(self) -> str:
-        return "1.0"
-    
-    def build_json_data(self) -> str:
+    def build_json_data(self) -> bytes:
         """构建分类名称更新数据"""
-        return json.dumps({"id": self.category_id, "name": self.name})
+        return _dumps({"id": self.category_id, "name": self.category_name})
 
 
-class EnumPushRequest(BaseRequest[EnumPushResponse]):
+class EnumPushRequest(BaseRequest[EnumPushResponse], response_class=EnumPushResponse):
     """枚举推送请求类"""
     
+    __slots__ = ("enum_name", "description", "items")
+    name = "enum.push"
+    version = "1.0"
+    
     def __init__(self, token: str, enum_name: str, description: str = "", items: Optional[List[Dict[str, Any]]] = None):
-        super().__init__(token, EnumPushResponse)
+        super().__init__(token)
         self.enum_name = enum_name
         self.description = description
         self.items = items or []
     
-    def name(self) -> str:
-        return "enum.push"
-    
-    def version(self) -> str:
-        return "1.0"
-    
-    def build_json_data(self) -> str:
+    def build_json_data(self) -> bytes:
         """构建枚举推送数据"""
         data = {
             "name": self.enum_name,
             "description": self.description,
             "items": self.items
         }
-        return json.dumps(data, ensure_ascii=False)
+        return _dumps(data)
 
 
-class EnumBatchPushRequest(BaseRequest[EnumPushResponse]):
+class EnumBatchPushRequest(BaseRequest[EnumPushResponse], response_class=EnumPushResponse):
     """批量枚举推送请求类"""
     
+    __slots__ = ("enums",)
+    name = "enum.batch.push"
+    version = "1.0"
+    
     def __init__(self, token: str, enums: List[Dict[str, Any]]):
-        super().__init__(token, EnumPushResponse)
+        super().__init__(token)
         self.enums = enums
     
-    def name(self) -> str:
-        return "enum.batch.push"
-    
-    def version(self) -> str:
-        return "1.0"
-    
-    def build_json_data(self) -> str:
+    def build_json_data(self) -> bytes:
         """构建批量枚举推送数据"""
-        return json.dumps({"enums": self.enums}, ensure_ascii=False)
+        return _dumps({"enums": self.enums})
 
 
-class ModuleDebugEnvSetRequest(BaseRequest[ModuleDebugEnvSetResponse]):
+class ModuleDebugEnvSetRequest(
+    BaseRequest[ModuleDebugEnvSetResponse], response_class=ModuleDebugEnvSetResponse
+):
     """设置模块调试环境请求类"""
     
+    __slots__ = ("env_name", "url")
+    name = "module.debug.env.set"
+    version = "1.0"
+    
     def __init__(self, token: str, name: str, url: str):
-        super().__init__(token, ModuleDebugEnvSetResponse)
-        self.name = name
+        super().__init__(token)
+        self.env_name = name
         self.url = url
     
-    def name(self) -> str:
-        return "module.debug.env.set"
-    
-    def version(self) -> str:
-        return "1.0"
-    
-    def build_json_data(self) -> str:
+    def build_json_data(self) -> bytes:
         """构建调试环境设置数据"""
-        return json.dumps({"name": self.name, "url": self.url})
+        return _dumps({"name": self.env_name, "url": self.url})
 
 
-class ModuleDebugEnvDeleteRequest(BaseRequest[ModuleDebugEnvDeleteResponse]):
+class ModuleDebugEnvDeleteRequest(
+    BaseRequest[ModuleDebugEnvDeleteResponse], response_class=ModuleDebugEnvDeleteResponse
+):
     """删除模块调试环境请求类"""
     
-    def __init__(self, token: str, name: str):
-        super().__init__(token, ModuleDebugEnvDeleteResponse)
-        self.name = name
+    __slots__ = ("env_name",)
+    name = "module.debug.env.delete"
+    version = "1.0"
     
-    def name(self) -> str:
-        return "module.debug.env.delete"
-    
-    def version(self) -> str:
-        return "1.0"
+    def __init__(self, token: str, name: str):
+        super().__init__(token)
+        self.env_name = name
     
-    def build_json_data(self) -> str:
+    def build_json_data(self) -> bytes:
         """构建调试环境删除数据"""
-        return json.dumps({"name": self.name})
+        return _dumps({"name": self.env_name})
 
 
 if __name__ == "__main__":
@@ -11,44 +11,34 @@ Environment Variables Required:
 """
 
 import asyncio
+import atexit
+import contextlib
+import functools
 import json
 import os
+import sys
+import time
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
 
+import httpx
 from mcp.server.fastmcp import FastMCP
-from pydantic import BaseModel, Field
-
-# 导入重构的客户端 (使用外部包)
-from torna_sdk import (
-    TornaClient,
-    TornaAPIError,
-    TornaConfig,
-    DocListRequest,
-    DocGetRequest,
-    DocPushRequest,
-    DocListResponse,
-    DocGetResponse,
-    DocPushResponse,
-    ModuleGetRequest,
-    ModuleGetResponse,
-    DocDetailsRequest,
-    DocDetailsResponse,
-    # 新增的完整功能
-    DocCategoryCreateRequest,
-    DocCategoryListRequest,
-    DocCategoryNameUpdateRequest,
-    EnumPushRequest,
-    EnumBatchPushRequest,
-    ModuleDebugEnvSetRequest,
-    ModuleDebugEnvDeleteRequest,
-    DocCategoryCreateResponse,
-    DocCategoryListResponse,
-    DocCategoryNameUpdateResponse,
-    EnumPushResponse,
-    ModuleDebugEnvSetResponse,
-    ModuleDebugEnvDeleteResponse,
-)
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+# JSON 输出 - 优先使用 orjson (可选依赖)，缺失时回退到标准库，两者输出格式一致
+try:
+    import orjson
+
+    def _dumps_pretty(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+except ImportError:
+    def _dumps_pretty(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+
+# 重构的客户端 (外部包 torna_sdk) 在首次使用时才导入，缩短服务启动时间；
+# 工具在执行请求时通过 _sdk() 取得请求类，模块缓存在 sys.modules 中，之后的导入只是一次字典查找
+if TYPE_CHECKING:
+    from torna_sdk import DocDetailsResponse, DocPushRequest, TornaClient
 
 # Initialize the MCP server
 torna_mcp_server = FastMCP("torna_mcp_refactored")
@@ -56,26 +46,139 @@ torna_mcp_server = FastMCP("torna_mcp_refactored")
 # Constants
 CHARACTER_LIMIT = 25000
 DEFAULT_API_URL = "http://localhost:7700"
+# 批量获取文档时单个 doc.details 请求携带的最大ID数，以及分批后的最大并发请求数
+BATCH_DOC_CHUNK_SIZE = 50
+# (HTTP 超时与连接池大小由 SDK 的 _client_options 统一配置，其连接数需覆盖这里的并发量)
+BATCH_DOC_CONCURRENCY = 16
 
-# Environment variables
-API_BASE_URL: Optional[str] = None
-TORNA_TOKEN: str = ""
+class TornaConfigError(ValueError):
+    """服务配置错误 (如缺少 TORNA_TOKEN)"""
 
 
-def _validate_environment() -> tuple[str, str]:
-    """验证必需的环境变量。"""
-    global API_BASE_URL, TORNA_TOKEN
+# Environment variables
+@functools.lru_cache(maxsize=1)
+def _env() -> tuple[str, str]:
+    """读取并验证必需的环境变量，返回 (base_url, token)。
 
-    API_BASE_URL = os.getenv("TORNA_URL", DEFAULT_API_URL)
-    TORNA_TOKEN = os.getenv("TORNA_TOKEN", "")
+    环境变量在进程生命周期内不变，验证通过后结果被缓存 (测试中可调用 _env.cache_clear() 重新读取)；
+    验证失败时抛出异常且不缓存。
+    """
+    base_url = os.getenv("TORNA_URL", DEFAULT_API_URL)
+    token = os.getenv("TORNA_TOKEN", "")
 
-    if not TORNA_TOKEN:
-        raise ValueError(
+    if not token:
+        raise TornaConfigError(
             "TORNA_TOKEN environment variable is required. "
             "Please set it to your Torna module access token."
         )
 
-    return API_BASE_URL, TORNA_TOKEN
+    return base_url, token
+
+
+# 进程内共享的客户端，首次调用工具时创建，所有工具复用同一个连接池
+# SDK 客户端为同步实现 (httpx.Client 线程安全)，工具中通过 asyncio.to_thread 执行请求，避免阻塞事件循环
+_client: Optional["TornaClient"] = None
+_client_stack = contextlib.ExitStack()
+
+
+def _get_client() -> "TornaClient":
+    """获取共享的 TornaClient (惰性初始化)
+
+    通过 SDK 支持的 with 用法进入客户端并保持到进程退出，连接池及其超时配置都由 SDK 提供。
+    """
+    global _client
+    if _client is None:
+        from torna_sdk import TornaClient
+
+        base_url, token = _env()
+        _client = _client_stack.enter_context(TornaClient(base_url, token))
+        atexit.register(_close_client)
+    return _client
+
+
+def _sdk() -> Any:
+    """返回 torna_sdk 模块 (首次调用时导入)
+
+    工具在 fetch 回调中通过它取得请求类，未安装 SDK 时的 ImportError 因此发生在 _run_tool 的 try 内，
+    作为错误信息返回而不是让工具调用崩溃。
+    """
+    import torna_sdk
+
+    return torna_sdk
+
+
+def _close_client() -> None:
+    """进程退出时关闭共享客户端"""
+    global _client
+    _client_stack.close()
+    _client = None
+
+
+# 只读接口的响应缓存: (请求类型, 请求数据) -> (过期时间, 响应)
+# 仅在事件循环线程中读写，无需加锁；任何写操作后整体清空并递增代数，
+# 与写操作并发、在清空之后才返回的读请求发现代数变化时不写入缓存 (其结果可能是写入前的旧数据)
+READ_CACHE_TTL = 30.0
+READ_CACHE_MAXSIZE = 512
+_read_cache: Dict[Tuple[type, Any], Tuple[float, Any]] = {}
+_read_cache_generation = 0
+
+
+async def _execute_read(client: "TornaClient", request: Any) -> Any:
+    """执行只读请求，成功的响应在 READ_CACHE_TTL 秒内直接复用"""
+    key = (type(request), request.build_json_data())
+    now = time.monotonic()
+    entry = _read_cache.get(key)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+
+    generation = _read_cache_generation
+    response = await asyncio.to_thread(client.execute, request)
+    if response.is_success() and generation == _read_cache_generation:
+        _read_cache.pop(key, None)
+        if len(_read_cache) >= READ_CACHE_MAXSIZE:
+            # 淘汰最早写入的条目
+            del _read_cache[next(iter(_read_cache))]
+        _read_cache[key] = (now + READ_CACHE_TTL, response)
+    return response
+
+
+async def _execute_write(client: "TornaClient", request: Any) -> Any:
+    """执行写请求，完成后清空只读缓存"""
+    global _read_cache_generation
+    try:
+        return await asyncio.to_thread(client.execute, request)
+    finally:
+        _read_cache_generation += 1
+        _read_cache.clear()
+
+
+async def _fetch_doc_details(client: "TornaClient", doc_ids: Sequence[str]) -> "DocDetailsResponse":
+    """批量获取文档详情
+
+    ID 数量不超过 BATCH_DOC_CHUNK_SIZE 时直接发送一个 doc.details 请求；否则按批拆分并发获取，
+    再按原顺序合并为一个响应。任一批失败时返回该批的响应。
+    """
+    from torna_sdk import DocDetailsRequest, DocDetailsResponse, TornaConfig
+
+    if len(doc_ids) <= BATCH_DOC_CHUNK_SIZE:
+        return await asyncio.to_thread(client.execute, DocDetailsRequest(client.token, doc_ids))
+
+    semaphore = asyncio.Semaphore(BATCH_DOC_CONCURRENCY)
+
+    async def fetch_chunk(chunk: Sequence[str]) -> "DocDetailsResponse":
+        async with semaphore:
+            return await asyncio.to_thread(client.execute, DocDetailsRequest(client.token, chunk))
+
+    responses = await asyncio.gather(*(
+        fetch_chunk(doc_ids[i:i + BATCH_DOC_CHUNK_SIZE])
+        for i in range(0, len(doc_ids), BATCH_DOC_CHUNK_SIZE)
+    ))
+    for response in responses:
+        if not response.is_success():
+            return response
+
+    docs = [doc for response in responses for doc in response.data or ()]
+    return DocDetailsResponse.from_dict({"code": TornaConfig.SUCCESS_CODE, "msg": responses[0].msg, "data": docs})
 
 
 # Input models
@@ -85,19 +188,30 @@ class ResponseFormat(str, Enum):
     MARKDOWN = "markdown"
 
 
-class DocListInput(BaseModel):
+class ToolInput(BaseModel):
+    """工具输入参数基类
+
+    参数只在 FastMCP 解析工具调用时校验一次，之后只读：frozen 禁止修改，多余字段直接忽略。
+    列表型参数使用元组 (默认值不需要 default_factory)，只含标量的输入模型因此可哈希。
+    """
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
+
+class DocListInput(ToolInput):
     """文档列表输入参数 - 使用重构客户端"""
-    doc_ids: Optional[List[str]] = Field(default=None, description="要列出的文档ID列表（可选）")
+    doc_ids: Optional[Tuple[str, ...]] = Field(default=None, description="要列出的文档ID列表（可选）")
     response_format: ResponseFormat = Field(default=ResponseFormat.MARKDOWN, description="输出格式")
+    limit: int = Field(default=50, ge=1, description="每页返回的最大条数")
+    offset: int = Field(default=0, ge=0, description="分页起始位置")
 
 
-class DocGetInput(BaseModel):
+class DocGetInput(ToolInput):
     """文档详情输入参数 - 使用重构客户端"""
     doc_id: str = Field(..., description="文档ID")
     response_format: ResponseFormat = Field(default=ResponseFormat.MARKDOWN, description="输出格式")
 
 
-class DocPushInput(BaseModel):
+class DocPushInput(ToolInput):
     """文档推送输入参数 - 使用重构客户端"""
     name: str = Field(..., description="文档名称")
     description: Optional[str] = Field(None, description="文档描述")
@@ -119,176 +233,299 @@ class DocPushInput(BaseModel):
     author: Optional[str] = Field(None, description="文档作者")
     response_format: ResponseFormat = Field(default=ResponseFormat.MARKDOWN, description="输出格式")
 
+    @field_validator("http_method")
+    @classmethod
+    def _upper_http_method(cls, value: str) -> str:
+        """HTTP方法在构建模型时统一转为大写"""
+        return value.upper()
+
 
-class ModuleInfoInput(BaseModel):
+class ModuleInfoInput(ToolInput):
     """模块信息输入参数 - 使用重构客户端"""
     response_format: ResponseFormat = Field(default=ResponseFormat.MARKDOWN, description="输出格式")
 
 
-class BatchDocDetailInput(BaseModel):
+class BatchDocDetailInput(ToolInput):
     """批量文档详情输入参数 - 使用重构客户端"""
-    doc_ids: List[str] = Field(..., description="要获取详情的文档ID列表")
+    doc_ids: Tuple[str, ...] = Field(..., description="要获取详情的文档ID列表")
     response_format: ResponseFormat = Field(default=ResponseFormat.MARKDOWN, description="输出格式")
+    limit: int = Field(default=50, ge=1, description="每页返回的最大条数")
+    offset: int = Field(default=0, ge=0, description="分页起始位置")
 
 
 # ==================== 新增的完整功能输入模型 ====================
 
-class DocCategoryCreateInput(BaseModel):
+class DocCategoryCreateInput(ToolInput):
     """创建分类输入参数"""
     name: str = Field(..., description="分类名称")
     response_format: ResponseFormat = Field(default=ResponseFormat.MARKDOWN, description="输出格式")
 
 
-class DocCategoryListInput(BaseModel):
+class DocCategoryListInput(ToolInput):
     """分类列表输入参数"""
     response_format: ResponseFormat = Field(default=ResponseFormat.MARKDOWN, description="输出格式")
+    limit: int = Field(default=50, ge=1, description="每页返回的最大条数")
+    offset: int = Field(default=0, ge=0, description="分页起始位置")
 
 
-class DocCategoryNameUpdateInput(BaseModel):
+class DocCategoryNameUpdateInput(ToolInput):
     """更新分类名称输入参数"""
     category_id: str = Field(..., description="分类ID")
     name: str = Field(..., description="新的分类名称")
     response_format: ResponseFormat = Field(default=ResponseFormat.MARKDOWN, description="输出格式")
 
 
-class EnumPushInput(BaseModel):
+class EnumPushInput(ToolInput):
     """枚举推送输入参数"""
     name: str = Field(..., description="枚举名称")
     description: Optional[str] = Field(default="", description="枚举说明")
-    items: Optional[List[Dict[str, Any]]] = Field(default_factory=list, description="枚举项列表")
+    items: Optional[Tuple[Dict[str, Any], ...]] = Field(default=(), description="枚举项列表")
     response_format: ResponseFormat = Field(default=ResponseFormat.MARKDOWN, description="输出格式")
 
 
-class EnumBatchPushInput(BaseModel):
+class EnumBatchPushInput(ToolInput):
     """批量枚举推送输入参数"""
     enums: List[Dict[str, Any]] = Field(..., description="枚举列表")
     response_format: ResponseFormat = Field(default=ResponseFormat.MARKDOWN, description="输出格式")
 
 
-class ModuleDebugEnvSetInput(BaseModel):
+class ModuleDebugEnvSetInput(ToolInput):
     """设置调试环境输入参数"""
     name: str = Field(..., description="环境名称")
     url: str = Field(..., description="调试环境URL")
     response_format: ResponseFormat = Field(default=ResponseFormat.MARKDOWN, description="输出格式")
 
 
-class ModuleDebugEnvDeleteInput(BaseModel):
+class ModuleDebugEnvDeleteInput(ToolInput):
     """删除调试环境输入参数"""
     name: str = Field(..., description="环境名称")
     response_format: ResponseFormat = Field(default=ResponseFormat.MARKDOWN, description="输出格式")
 
 
 # Shared utility functions
-def _format_response(result: Dict[str, Any], format_type: ResponseFormat, operation: str) -> str:
-    """格式化响应输出 - 基于重构客户端"""
-    try:
-        if isinstance(result, dict) and "data" in result:
-            data = result["data"]
-        else:
-            data = result
-        
-        if format_type == ResponseFormat.JSON:
-            return json.dumps({
-                "operation": operation,
-                "success": True,
-                "result": data
-            }, ensure_ascii=False, indent=2)
-        else:
-            # Markdown format
-            return _format_as_markdown(data, operation)
-            
-    except Exception as e:
-        return f"Error formatting response: {str(e)}"
+def _paginate(data: Any, offset: int, limit: Optional[int]) -> Tuple[Any, bool, Optional[int]]:
+    """指定 limit 时对列表结果分页，返回 (当前页数据, 是否分页, 下一页起始位置)"""
+    if limit is None or not isinstance(data, list):
+        return data, False, None
+    end = offset + limit
+    return data[offset:end], True, (end if end < len(data) else None)
+
+
+def _truncate(output: str, paginated: bool) -> str:
+    """输出超过 CHARACTER_LIMIT 时截断并附提示，只有支持分页的工具才提示使用 limit/offset"""
+    if len(output) <= CHARACTER_LIMIT:
+        return output
+    notice = f"Output truncated at {CHARACTER_LIMIT} characters."
+    if paginated:
+        notice += " Use limit/offset to fetch fewer results per call."
+    return f"{output[:CHARACTER_LIMIT]}\n\n[{notice}]"
+
+
+def _format_json(data: Any, operation: str, offset: int = 0, limit: Optional[int] = None) -> str:
+    """将响应数据格式化为JSON"""
+    data, paginated, next_offset = _paginate(data, offset, limit)
+    payload = {
+        "operation": operation,
+        "success": True,
+        "result": data
+    }
+    if paginated:
+        payload["next_offset"] = next_offset
+    return _truncate(_dumps_pretty(payload), limit is not None)
+
+
+def _format_markdown(data: Any, operation: str, offset: int = 0, limit: Optional[int] = None) -> str:
+    """将响应数据格式化为Markdown"""
+    data, _, next_offset = _paginate(data, offset, limit)
+    output = _format_as_markdown(data, operation)
+    if next_offset is not None:
+        output += f"\n\n[More results available. Use offset={next_offset} to continue.]"
+    return _truncate(output, limit is not None)
+
+
+# 输出格式 -> 格式化函数，工具中按参数直接选择
+_FORMATTERS = {
+    ResponseFormat.JSON: _format_json,
+    ResponseFormat.MARKDOWN: _format_markdown,
+}
+
+
+# 各工具的操作名及其 Markdown 标题，导入时生成
+_OP_HEADERS = {
+    operation: f"## {operation}\n\n"
+    for operation in (
+        "Document List",
+        "Document Detail",
+        "Document Push",
+        "Module Info",
+        "Batch Document Details",
+        "Create Category",
+        "List Categories",
+        "Update Category Name",
+        "Push Enum",
+        "Batch Push Enums",
+        "Set Debug Environment",
+        "Delete Debug Environment",
+    )
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _nested_operation(operation: str, key: Any) -> Tuple[str, str]:
+    """嵌套字段的操作名及其标题，如 ("Module Info - debugEnvs", "## Module Info - debugEnvs\n\n")"""
+    name = f"{operation} - {key}"
+    return name, f"## {name}\n\n"
 
 
 def _format_as_markdown(data: Any, operation: str) -> str:
-    """将数据格式化为Markdown"""
-    try:
-        if isinstance(data, list):
-            if not data:
-                return f"## {operation}\n\n暂无数据"
-            
-            markdown = f"## {operation}\n\n"
-            for item in data:
-                if isinstance(item, dict):
-                    markdown += f"### {item.get('name', 'Unknown')}\n\n"
-                    for key, value in item.items():
-                        if key not in ['name']:
-                            markdown += f"- **{key}**: {value}\n"
-                    markdown += "\n"
-                else:
-                    markdown += f"- {item}\n"
-            return markdown
-            
-        elif isinstance(data, dict):
-            markdown = f"## {operation}\n\n"
-            for key, value in data.items():
-                if isinstance(value, (list, dict)):
-                    markdown += f"### {key}\n\n"
-                    markdown += _format_as_markdown(value, f"{operation} - {key}")
-                else:
-                    markdown += f"- **{key}**: {value}\n"
-            return markdown
-            
-        else:
-            return f"## {operation}\n\n{str(data)}"
-            
-    except Exception as e:
-        return f"## {operation}\n\nError formatting data: {str(e)}"
+    """将数据格式化为Markdown (格式化异常交给工具的错误处理，不作为结果返回)"""
+    parts: List[str] = []
+    header = _OP_HEADERS.get(operation) or f"## {operation}\n\n"
+    _append_markdown(parts, data, operation, header)
+    return "".join(parts)
+
+
+def _append_markdown(parts: List[str], data: Any, operation: str, header: str) -> None:
+    """将数据的Markdown片段追加到 parts，嵌套结构递归追加到同一列表，最后统一 join"""
+    if isinstance(data, list):
+        if not data:
+            parts.append(f"{header}暂无数据")
+            return
+        
+        parts.append(header)
+        for item in data:
+            if isinstance(item, dict):
+                parts.append(f"### {item.get('name', 'Unknown')}\n\n")
+                for key, value in item.items():
+                    if key != 'name':
+                        parts.append(f"- **{key}**: {value}\n")
+                parts.append("\n")
+            else:
+                parts.append(f"- {item}\n")
+        
+    elif isinstance(data, dict):
+        parts.append(header)
+        for key, value in data.items():
+            if isinstance(value, (list, dict)):
+                parts.append(f"### {key}\n\n")
+                _append_markdown(parts, value, *_nested_operation(operation, key))
+            else:
+                parts.append(f"- **{key}**: {value}\n")
+        
+    else:
+        parts.append(f"{header}{str(data)}")
+
+
+# HTTP 状态码 -> 错误提示
+_STATUS_MESSAGES = {
+    404: "Error: Resource not found. Please check the ID is correct.",
+    403: "Error: Permission denied. You don't have access to this resource.",
+    429: "Error: Rate limit exceeded. Please wait before making more requests.",
+}
+
+_TIMEOUT_ERRORS = (asyncio.TimeoutError, TimeoutError, httpx.TimeoutException)
 
 
 def _handle_api_error_refactored(e: Exception) -> str:
-    """一致的错误格式化 - 基于重构客户端"""
-    if isinstance(e, TornaAPIError):
+    """一致的错误格式化 - 基于重构客户端 (本身不导入 SDK，SDK 缺失时也不会失败)"""
+    sdk = sys.modules.get("torna_sdk")
+    if sdk is not None and isinstance(e, sdk.TornaAPIError):
         return f"Torna API Error {e.code}: {e.message}"
-    elif hasattr(e, 'response'):  # httpx.HTTPStatusError
-        if e.response.status_code == 404:
-            return "Error: Resource not found. Please check the ID is correct."
-        elif e.response.status_code == 403:
-            return "Error: Permission denied. You don't have access to this resource."
-        elif e.response.status_code == 429:
-            return "Error: Rate limit exceeded. Please wait before making more requests."
-        return f"Error: API request failed with status {e.response.status_code}"
-    elif "timeout" in str(e).lower():
-        return "Error: Request timed out. Please try again."
-    elif "TORNA_TOKEN" in str(e):
+    if isinstance(e, TornaConfigError):
         return f"Configuration error: {str(e)}"
+    if isinstance(e, ImportError):
+        return f"Configuration error: {str(e)}. Please install torna-sdk (pip install torna-sdk)."
+    if isinstance(e, _TIMEOUT_ERRORS):
+        return "Error: Request timed out. Please try again."
+    if isinstance(e, httpx.HTTPStatusError):
+        status_code = e.response.status_code
+        return _STATUS_MESSAGES.get(status_code) or f"Error: API request failed with status {status_code}"
     return f"Error: Unexpected error occurred: {type(e).__name__}: {str(e)}"
 
 
+# 布尔值 -> Torna 使用的 "0"/"1" 字符串，以 bool 作为下标
+_BOOL_STR = ("0", "1")
+
+# DocPushInput 字段 -> 推送数据键，未列出的字段 (调试环境、作者等) 不进入推送数据
+_PUSH_KEY_MAP = {
+    "name": "name",
+    "description": "description",
+    "url": "url",
+    "http_method": "httpMethod",
+    "content_type": "contentType",
+    "is_folder": "isFolder",
+    "parent_id": "parentId",
+    "is_show": "isShow",
+    "header_params": "headerParams",
+    "request_params": "requestParams",
+    "path_params": "pathParams",
+    "query_params": "queryParams",
+    "response_params": "responseParams",
+    "error_codes": "errorCodeParams",
+}
+_PUSH_FIELDS = frozenset(_PUSH_KEY_MAP)
+
+# 参数列表字段，仅在非空时推送
+_PUSH_PARAM_FIELDS = frozenset({
+    "header_params", "request_params", "path_params", "query_params", "response_params", "error_codes",
+})
+
+
 def _format_doc_push_data_refactored(input_data: DocPushInput) -> List[Dict[str, Any]]:
-    """格式化推送数据 - 基于重构客户端"""
+    """格式化推送数据 - 基于重构客户端 (一次 model_dump 后按键映射转换)"""
+    raw = input_data.model_dump(include=_PUSH_FIELDS)
     doc_data = {
-        "name": input_data.name,
-        "description": input_data.description or "",
-        "url": input_data.url,
-        "httpMethod": input_data.http_method.upper(),
-        "contentType": input_data.content_type,
-        "isFolder": "1" if input_data.is_folder else "0",
-        "parentId": input_data.parent_id or "",
-        "isShow": "1" if input_data.is_show else "0",
+        _PUSH_KEY_MAP[field]: value
+        for field, value in raw.items()
+        if value or field not in _PUSH_PARAM_FIELDS
     }
+    doc_data["description"] = raw["description"] or ""
+    doc_data["isFolder"] = _BOOL_STR[raw["is_folder"]]
+    doc_data["parentId"] = raw["parent_id"] or ""
+    doc_data["isShow"] = _BOOL_STR[raw["is_show"]]
 
-    # 设置参数
-    if input_data.header_params:
-        doc_data["headerParams"] = input_data.header_params
+    return [doc_data]
 
-    if input_data.request_params:
-        doc_data["requestParams"] = input_data.request_params
 
-    if input_data.path_params:
-        doc_data["pathParams"] = input_data.path_params
+def _build_push_request(token: str, params: DocPushInput) -> "DocPushRequest":
+    """构建文档推送请求"""
+    from torna_sdk import DocPushRequest
 
-    if input_data.query_params:
-        doc_data["queryParams"] = input_data.query_params
+    request = DocPushRequest(token)
+    request.set_apis(_format_doc_push_data_refactored(params))
 
-    if input_data.response_params:
-        doc_data["responseParams"] = input_data.response_params
+    # 设置调试环境（如果提供）
+    if params.debug_env_name and params.debug_env_url:
+        request.set_debug_envs([{"name": params.debug_env_name, "url": params.debug_env_url}])
 
-    if input_data.error_codes:
-        doc_data["errorCodeParams"] = input_data.error_codes
+    return request
 
-    return [doc_data]
+
+async def _run_tool(
+    params: ToolInput,
+    operation: str,
+    fetch: Callable[["TornaClient"], Awaitable[Any]],
+    paginate: bool = False,
+) -> str:
+    """所有工具共用的执行流程: 获取共享客户端 -> 执行请求 -> 检查响应 -> 按输出格式格式化
+
+    fetch 接收共享客户端并返回 SDK 响应 (通过 _execute_read / _execute_write / _fetch_doc_details)；
+    paginate 为 True 时按 params.offset/params.limit 对列表结果分页。
+    """
+    try:
+        response = await fetch(_get_client())
+        
+        # 检查响应是否成功
+        if not response.is_success():
+            return f"Error: {response.msg} (code: {response.code})"
+        
+        formatter = _FORMATTERS[params.response_format]
+        if paginate:
+            return formatter(response.data, operation, params.offset, params.limit)
+        return formatter(response.data, operation)
+        
+    except Exception as e:
+        return _handle_api_error_refactored(e)
 
 
 # Tool implementations
@@ -311,6 +548,8 @@ async def torna_list_documents(params: DocListInput) -> str:
         params (DocListInput): 验证的输入参数包含：
             - doc_ids (List[str], optional): 要列出的文档ID列表
             - response_format (ResponseFormat): 输出格式 (json 或 markdown)
+            - limit (int): 每页返回的最大条数，默认 50
+            - offset (int): 分页起始位置，默认 0
 
     Returns:
         str: JSON格式化或markdown格式化的响应，包含操作结果
@@ -325,29 +564,16 @@ async def torna_list_documents(params: DocListInput) -> str:
         错误响应:
         "Error: <error message>"
     """
-    try:
-        # 验证环境变量
-        base_url, token = _validate_environment()
-        
-        # 使用重构客户端
-        with TornaClient(base_url, token) as client:
-            if params.doc_ids:
-                # 使用批量文档详情
-                request = DocDetailsRequest(token, params.doc_ids)
-                response = client.execute(request)
-            else:
-                # 使用文档列表
-                request = DocListRequest(token)
-                response = client.execute(request)
-        
-        # 检查响应是否成功
-        if not response.is_success():
-            return f"Error: {response.msg} (code: {response.code})"
-        
-        return _format_response(response.to_dict(), params.response_format, "Document List")
-        
-    except Exception as e:
-        return _handle_api_error_refactored(e)
+    if params.doc_ids:
+        # 使用批量文档详情
+        return await _run_tool(
+            params, "Document List", lambda client: _fetch_doc_details(client, params.doc_ids), paginate=True
+        )
+    # 使用文档列表
+    return await _run_tool(
+        params, "Document List",
+        lambda client: _execute_read(client, _sdk().DocListRequest(client.token)), paginate=True,
+    )
 
 
 @torna_mcp_server.tool(
@@ -388,23 +614,10 @@ async def torna_get_document_detail(params: DocGetInput) -> str:
         错误响应:
         "Error: <error message>"
     """
-    try:
-        # 验证环境变量
-        base_url, token = _validate_environment()
-        
-        # 使用重构客户端
-        with TornaClient(base_url, token) as client:
-            request = DocGetRequest(token, params.doc_id)
-            response = client.execute(request)
-        
-        # 检查响应是否成功
-        if not response.is_success():
-            return f"Error: {response.msg} (code: {response.code})"
-        
-        return _format_response(response.to_dict(), params.response_format, "Document Detail")
-        
-    except Exception as e:
-        return _handle_api_error_refactored(e)
+    return await _run_tool(
+        params, "Document Detail",
+        lambda client: _execute_read(client, _sdk().DocGetRequest(client.token, params.doc_id)),
+    )
 
 
 @torna_mcp_server.tool(
@@ -442,35 +655,9 @@ async def torna_push_document(params: DocPushInput) -> str:
         错误响应:
         "Error: <error message>"
     """
-    try:
-        # 验证环境变量
-        base_url, token = _validate_environment()
-        
-        # 格式化推送数据
-        apis_data = _format_doc_push_data_refactored(params)
-        
-        # 构建推送请求
-        with TornaClient(base_url, token) as client:
-            request = DocPushRequest(token)
-            
-            # 设置API数据
-            request.set_apis(apis_data)
-            
-            # 设置调试环境（如果提供）
-            if params.debug_env_name and params.debug_env_url:
-                debug_envs = [{"name": params.debug_env_name, "url": params.debug_env_url}]
-                request.set_debug_envs(debug_envs)
-            
-            response = client.execute(request)
-        
-        # 检查响应是否成功
-        if not response.is_success():
-            return f"Error: {response.msg} (code: {response.code})"
-        
-        return _format_response(response.to_dict(), params.response_format, "Document Push")
-        
-    except Exception as e:
-        return _handle_api_error_refactored(e)
+    return await _run_tool(
+        params, "Document Push", lambda client: _execute_write(client, _build_push_request(client.token, params))
+    )
 
 
 @torna_mcp_server.tool(
@@ -509,23 +696,9 @@ async def torna_get_module_info(params: ModuleInfoInput) -> str:
         错误响应:
         "Error: <error message>"
     """
-    try:
-        # 验证环境变量
-        base_url, token = _validate_environment()
-        
-        # 使用重构客户端
-        with TornaClient(base_url, token) as client:
-            request = ModuleGetRequest(token)
-            response = client.execute(request)
-        
-        # 检查响应是否成功
-        if not response.is_success():
-            return f"Error: {response.msg} (code: {response.code})"
-        
-        return _format_response(response.to_dict(), params.response_format, "Module Info")
-        
-    except Exception as e:
-        return _handle_api_error_refactored(e)
+    return await _run_tool(
+        params, "Module Info", lambda client: _execute_read(client, _sdk().ModuleGetRequest(client.token))
+    )
 
 
 @torna_mcp_server.tool(
@@ -547,6 +720,8 @@ async def torna_get_batch_documents(params: BatchDocDetailInput) -> str:
         params (BatchDocDetailInput): 验证的输入参数包含：
             - doc_ids (List[str]): 要获取详情的文档ID列表（必需）
             - response_format (ResponseFormat): 输出格式 (json 或 markdown)
+            - limit (int): 每页返回的最大条数，默认 50
+            - offset (int): 分页起始位置，默认 0
 
     Returns:
         str: JSON格式化或markdown格式化的响应，包含批量文档详情
@@ -564,23 +739,9 @@ async def torna_get_batch_documents(params: BatchDocDetailInput) -> str:
         错误响应:
         "Error: <error message>"
     """
-    try:
-        # 验证环境变量
-        base_url, token = _validate_environment()
-        
-        # 使用重构客户端
-        with TornaClient(base_url, token) as client:
-            request = DocDetailsRequest(token, params.doc_ids)
-            response = client.execute(request)
-        
-        # 检查响应是否成功
-        if not response.is_success():
-            return f"Error: {response.msg} (code: {response.code})"
-        
-        return _format_response(response.to_dict(), params.response_format, "Batch Document Details")
-        
-    except Exception as e:
-        return _handle_api_error_refactored(e)
+    return await _run_tool(
+        params, "Batch Document Details", lambda client: _fetch_doc_details(client, params.doc_ids), paginate=True
+    )
 
 
 # ==================== 新增的完整功能 MCP 工具 ====================
@@ -606,20 +767,10 @@ async def torna_create_category(params: DocCategoryCreateInput) -> str:
     Returns:
         str: 分类创建结果
     """
-    try:
-        base_url, token = _validate_environment()
-        
-        with TornaClient(base_url, token) as client:
-            request = DocCategoryCreateRequest(token, params.name)
-            response = client.execute(request)
-        
-        if not response.is_success():
-            return f"Error: {response.msg} (code: {response.code})"
-        
-        return _format_response(response.to_dict(), params.response_format, "Create Category")
-        
-    except Exception as e:
-        return _handle_api_error_refactored(e)
+    return await _run_tool(
+        params, "Create Category",
+        lambda client: _execute_write(client, _sdk().DocCategoryCreateRequest(client.token, params.name)),
+    )
 
 
 @torna_mcp_server.tool(
@@ -643,20 +794,10 @@ async def torna_list_categories(params: DocCategoryListInput) -> str:
     Returns:
         str: 分类列表结果
     """
-    try:
-        base_url, token = _validate_environment()
-        
-        with TornaClient(base_url, token) as client:
-            request = DocCategoryListRequest(token)
-            response = client.execute(request)
-        
-        if not response.is_success():
-            return f"Error: {response.msg} (code: {response.code})"
-        
-        return _format_response(response.to_dict(), params.response_format, "List Categories")
-        
-    except Exception as e:
-        return _handle_api_error_refactored(e)
+    return await _run_tool(
+        params, "List Categories",
+        lambda client: _execute_read(client, _sdk().DocCategoryListRequest(client.token)), paginate=True,
+    )
 
 
 @torna_mcp_server.tool(
@@ -680,20 +821,12 @@ async def torna_update_category_name(params: DocCategoryNameUpdateInput) -> str:
     Returns:
         str: 分类名称更新结果
     """
-    try:
-        base_url, token = _validate_environment()
-        
-        with TornaClient(base_url, token) as client:
-            request = DocCategoryNameUpdateRequest(token, params.category_id, params.name)
-            response = client.execute(request)
-        
-        if not response.is_success():
-            return f"Error: {response.msg} (code: {response.code})"
-        
-        return _format_response(response.to_dict(), params.response_format, "Update Category Name")
-        
-    except Exception as e:
-        return _handle_api_error_refactored(e)
+    return await _run_tool(
+        params, "Update Category Name",
+        lambda client: _execute_write(
+            client, _sdk().DocCategoryNameUpdateRequest(client.token, params.category_id, params.name)
+        ),
+    )
 
 
 @torna_mcp_server.tool(
@@ -717,20 +850,12 @@ async def torna_push_enum(params: EnumPushInput) -> str:
     Returns:
         str: 枚举推送结果
     """
-    try:
-        base_url, token = _validate_environment()
-        
-        with TornaClient(base_url, token) as client:
-            request = EnumPushRequest(token, params.name, params.description, params.items)
-            response = client.execute(request)
-        
-        if not response.is_success():
-            return f"Error: {response.msg} (code: {response.code})"
-        
-        return _format_response(response.to_dict(), params.response_format, "Push Enum")
-        
-    except Exception as e:
-        return _handle_api_error_refactored(e)
+    return await _run_tool(
+        params, "Push Enum",
+        lambda client: _execute_write(
+            client, _sdk().EnumPushRequest(client.token, params.name, params.description, params.items)
+        ),
+    )
 
 
 @torna_mcp_server.tool(
@@ -754,20 +879,10 @@ async def torna_batch_push_enums(params: EnumBatchPushInput) -> str:
     Returns:
         str: 批量枚举推送结果
     """
-    try:
-        base_url, token = _validate_environment()
-        
-        with TornaClient(base_url, token) as client:
-            request = EnumBatchPushRequest(token, params.enums)
-            response = client.execute(request)
-        
-        if not response.is_success():
-            return f"Error: {response.msg} (code: {response.code})"
-        
-        return _format_response(response.to_dict(), params.response_format, "Batch Push Enums")
-        
-    except Exception as e:
-        return _handle_api_error_refactored(e)
+    return await _run_tool(
+        params, "Batch Push Enums",
+        lambda client: _execute_write(client, _sdk().EnumBatchPushRequest(client.token, params.enums)),
+    )
 
 
 @torna_mcp_server.tool(
@@ -791,20 +906,12 @@ async def torna_set_debug_env(params: ModuleDebugEnvSetInput) -> str:
     Returns:
         str: 调试环境设置结果
     """
-    try:
-        base_url, token = _validate_environment()
-        
-        with TornaClient(base_url, token) as client:
-            request = ModuleDebugEnvSetRequest(token, params.name, params.url)
-            response = client.execute(request)
-        
-        if not response.is_success():
-            return f"Error: {response.msg} (code: {response.code})"
-        
-        return _format_response(response.to_dict(), params.response_format, "Set Debug Environment")
-        
-    except Exception as e:
-        return _handle_api_error_refactored(e)
+    return await _run_tool(
+        params, "Set Debug Environment",
+        lambda client: _execute_write(
+            client, _sdk().ModuleDebugEnvSetRequest(client.token, params.name, params.url)
+        ),
+    )
 
 
 @torna_mcp_server.tool(
@@ -828,20 +935,10 @@ async def torna_delete_debug_env(params: ModuleDebugEnvDeleteInput) -> str:
     Returns:
         str: 调试环境删除结果
     """
-    try:
-        base_url, token = _validate_environment()
-        
-        with TornaClient(base_url, token) as client:
-            request = ModuleDebugEnvDeleteRequest(token, params.name)
-            response = client.execute(request)
-        
-        if not response.is_success():
-            return f"Error: {response.msg} (code: {response.code})"
-        
-        return _format_response(response.to_dict(), params.response_format, "Delete Debug Environment")
-        
-    except Exception as e:
-        return _handle_api_error_refactored(e)
+    return await _run_tool(
+        params, "Delete Debug Environment",
+        lambda client: _execute_write(client, _sdk().ModuleDebugEnvDeleteRequest(client.token, params.name)),
+    )
 
 
 # Main function
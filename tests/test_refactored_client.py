@@ -2,16 +2,24 @@
 Torna Python SDK 测试套件 - 参考 Java SDK 的测试结构
 """
 
+import asyncio
 import unittest
 import json
-from unittest.mock import Mock, patch
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
 from typing import Dict, Any
+from urllib.parse import unquote
+
+import httpx
 
 import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from torna_mcp.refactored_client import (
+    AsyncTornaClient,
+    BaseRequest,
     TornaClient,
     TornaAPIError,
     DocListRequest,
@@ -24,21 +32,33 @@ from torna_mcp.refactored_client import (
     ModuleGetResponse,
     DocDetailsRequest,
     DocDetailsResponse,
+    DocCategoryCreateRequest,
+    DocCategoryNameUpdateRequest,
+    ModuleDebugEnvSetRequest,
+    ModuleDebugEnvDeleteRequest,
     RequestForm,
-    TornaConfig
+    Response,
+    TornaConfig,
+    _DocLoader
 )
 
 
+def encode_payload(payload: Dict[str, Any]) -> bytes:
+    """序列化模拟响应 - 使用紧凑分隔符，不输出多余空格"""
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
 class BaseTest(unittest.TestCase):
     """测试基类 - 参考 Java SDK 的 BaseTest"""
     
-    def setUp(self):
-        """测试初始化"""
-        self.base_url = "http://localhost:7700/api"
-        self.token = "test-token-123456"
+    @classmethod
+    def setUpClass(cls):
+        """测试初始化 - 模拟数据只构建并序列化一次，整个测试类共享"""
+        cls.base_url = "http://localhost:7700/api"
+        cls.token = "test-token-123456"
         
         # 创建模拟响应数据
-        self.mock_success_response = {
+        cls.mock_success_response = {
             "code": "0",
             "msg": "success",
             "data": [
@@ -52,11 +72,23 @@ class BaseTest(unittest.TestCase):
             ]
         }
         
-        self.mock_error_response = {
+        cls.mock_error_response = {
             "code": "-1",
             "msg": "Token无效",
             "data": None
         }
+        
+        # 客户端读取的是响应字节，预先序列化
+        cls.mock_success_content = encode_payload(cls.mock_success_response)
+        cls.mock_error_content = encode_payload(cls.mock_error_response)
+        
+        # 整个测试类共享一个客户端 (HTTP 调用均被 mock，仅需执行 execute)
+        cls._client = TornaClient(cls.base_url, cls.token).__enter__()
+    
+    @classmethod
+    def tearDownClass(cls):
+        """释放共享客户端"""
+        cls._client.__exit__(None, None, None)
     
     def print_response(self, response):
         """打印响应结果 - 参考 Java SDK"""
@@ -66,17 +98,78 @@ class BaseTest(unittest.TestCase):
             print(f"❌ 失败: code={response.code}, msg={response.msg}")
 
 
-class TestDocListRequest(BaseTest):
+class PatchedPostTest(BaseTest):
+    """同步 HTTP 调用测试基类 - 直接替换 httpx.Client.post，返回 self.post_response"""
+    
+    def setUp(self):
+        """每个测试替换 post 并在结束后恢复，调用参数记录在 self.post_calls"""
+        self.post_response = None
+        self.post_calls = []
+        
+        def fake_post(client, url, **kwargs):
+            self.post_calls.append(kwargs)
+            return self.post_response
+        
+        original_post = httpx.Client.post
+        httpx.Client.post = fake_post
+        self.addCleanup(setattr, httpx.Client, "post", original_post)
+
+
+class TestDocListRequest(PatchedPostTest):
     """文档列表请求测试 - 参考 Java SDK 的 testDocList()"""
     
     def test_doc_list_creation(self):
         """测试文档列表请求创建"""
         request = DocListRequest(self.token)
         
-        self.assertEqual(request.name(), "doc.list")
-        self.assertEqual(request.version(), "1.0")
+        self.assertEqual(request.name, "doc.list")
+        self.assertEqual(request.version, "1.0")
         self.assertEqual(request.token, self.token)
     
+    def test_response_class_registration(self):
+        """测试响应类在类定义时注册，实例不再保存 response_class"""
+        self.assertIs(DocListRequest.response_class, DocListResponse)
+        self.assertIs(DocDetailsRequest.response_class, DocDetailsResponse)
+        self.assertNotIn("response_class", BaseRequest.__slots__)
+        
+        class CustomResponse(Response):
+            __slots__ = ()
+        
+        class CustomRequest(BaseRequest, response_class=CustomResponse):
+            __slots__ = ()
+            name = "custom.get"
+            version = "1.0"
+        
+        class AliasRequest(CustomRequest, response_class=Response[Dict[str, Any]]):
+            __slots__ = ()
+        
+        response = CustomRequest(self.token).parse_response(b'{"code": "0", "msg": "ok", "data": {}}')
+        self.assertIsInstance(response, CustomResponse)
+        self.assertEqual(response.data, {})
+        # 参数化别名解析为原始类
+        self.assertIs(AliasRequest.response_class, Response)
+    
+    def test_response_classes_distinct(self):
+        """测试各接口响应类互不相同，且支持 isinstance 检查"""
+        self.assertIsNot(DocListResponse, DocDetailsResponse)
+        self.assertTrue(issubclass(DocListResponse, Response))
+        
+        response = DocListResponse.from_dict(self.mock_success_response)
+        self.assertIsInstance(response, DocListResponse)
+        self.assertNotIsInstance(response, DocDetailsResponse)
+    
+    def test_parse_response(self):
+        """测试响应解析委托给响应类，非法内容抛出 PARSE_ERROR"""
+        request = DocListRequest(self.token)
+        response = request.parse_response(self.mock_success_content)
+        
+        self.assertIsInstance(response, DocListResponse)
+        self.assertEqual(response.to_dict(), self.mock_success_response)
+        
+        with self.assertRaises(TornaAPIError) as ctx:
+            request.parse_response(b"<html>")
+        self.assertEqual(ctx.exception.code, "PARSE_ERROR")
+    
     def test_doc_list_form_creation(self):
         """测试文档列表请求表单创建"""
         request = DocListRequest(self.token)
@@ -86,24 +179,23 @@ class TestDocListRequest(BaseTest):
         self.assertEqual(form.get_form()["name"], "doc.list")
         self.assertEqual(form.get_form()["version"], "1.0")
         self.assertEqual(form.get_form()["access_token"], self.token)
+        datetime.strptime(form.get_form()["timestamp"], TornaConfig.TIMESTAMP_PATTERN)
         
         # 验证data字段编码正确
         data = form.get_form()["data"]
         self.assertEqual(data, "%7B%7D")  # URL编码的空JSON对象
     
-    @patch('torna_mcp.refactored_client.httpx.Client.post')
-    def test_doc_list_execution(self, mock_post):
+    def test_doc_list_execution(self):
         """测试文档列表请求执行"""
         # 模拟成功响应
-        mock_response = Mock()
-        mock_response.text = json.dumps(self.mock_success_response)
-        mock_response.raise_for_status = Mock()
-        mock_post.return_value = mock_response
+        self.post_response = SimpleNamespace(
+            content=self.mock_success_content,
+            raise_for_status=lambda: None
+        )
         
-        # 创建客户端并执行请求
-        with TornaClient(self.base_url, self.token) as client:
-            request = DocListRequest(self.token)
-            response = client.execute(request)
+        # 使用共享客户端执行请求
+        request = DocListRequest(self.token)
+        response = self._client.execute(request)
         
         self.assertTrue(response.is_success())
         self.assertEqual(response.code, "0")
@@ -112,7 +204,7 @@ class TestDocListRequest(BaseTest):
         self.assertEqual(response.data[0]["name"], "用户登录接口")
 
 
-class TestDocGetRequest(BaseTest):
+class TestDocGetRequest(PatchedPostTest):
     """文档详情请求测试 - 参考 Java SDK 的 testDocGetRequest()"""
     
     def test_doc_get_creation(self):
@@ -120,8 +212,8 @@ class TestDocGetRequest(BaseTest):
         doc_id = "test-doc-123"
         request = DocGetRequest(self.token, doc_id)
         
-        self.assertEqual(request.name(), "doc.detail")
-        self.assertEqual(request.version(), "1.0")
+        self.assertEqual(request.name, "doc.detail")
+        self.assertEqual(request.version, "1.0")
         self.assertEqual(request.doc_id, doc_id)
     
     def test_doc_get_json_data(self):
@@ -132,8 +224,15 @@ class TestDocGetRequest(BaseTest):
         json_data = json.loads(request.build_json_data())
         self.assertEqual(json_data["id"], doc_id)
     
-    @patch('torna_mcp.refactored_client.httpx.Client.post')
-    def test_doc_get_execution(self, mock_post):
+    def test_doc_get_slots(self):
+        """测试请求对象使用 __slots__，不分配实例 __dict__"""
+        request = DocGetRequest(self.token, "test-doc-123")
+        
+        self.assertFalse(hasattr(request, "__dict__"))
+        with self.assertRaises(AttributeError):
+            request.unknown_field = "value"
+    
+    def test_doc_get_execution(self):
         """测试文档详情请求执行"""
         doc_id = "test-doc-123"
         mock_response_data = {
@@ -148,14 +247,13 @@ class TestDocGetRequest(BaseTest):
             }
         }
         
-        mock_response = Mock()
-        mock_response.text = json.dumps(mock_response_data)
-        mock_response.raise_for_status = Mock()
-        mock_post.return_value = mock_response
+        self.post_response = SimpleNamespace(
+            content=encode_payload(mock_response_data),
+            raise_for_status=lambda: None
+        )
         
-        with TornaClient(self.base_url, self.token) as client:
-            request = DocGetRequest(self.token, doc_id)
-            response = client.execute(request)
+        request = DocGetRequest(self.token, doc_id)
+        response = self._client.execute(request)
         
         self.assertTrue(response.is_success())
         self.assertEqual(response.data["id"], doc_id)
@@ -169,8 +267,8 @@ class TestDocPushRequest(BaseTest):
         """测试文档推送请求创建"""
         request = DocPushRequest(self.token)
         
-        self.assertEqual(request.name(), "doc.push")
-        self.assertEqual(request.version(), "1.0")
+        self.assertEqual(request.name, "doc.push")
+        self.assertEqual(request.version, "1.0")
         self.assertIsNone(request.apis)
         self.assertIsNone(request.debug_envs)
     
@@ -203,23 +301,20 @@ class TestDocPushRequest(BaseTest):
     
     def test_doc_push_json_data_building(self):
         """测试文档推送 JSON 数据构建"""
-        request = DocPushRequest(self.token)
-        
-        # 只有 API 数据
         apis = [{"name": "用户登录", "url": "/api/login"}]
-        request.set_apis(apis)
-        json_data = json.loads(request.build_json_data())
-        self.assertIn("apis", json_data)
-        self.assertEqual(json_data["apis"], apis)
+        debug_envs = [{"name": "测试", "url": "http://test.com"}]
+        request = DocPushRequest(self.token).set_apis(apis).set_debug_envs(debug_envs)
         
         # 同时有 API 和调试环境数据
-        debug_envs = [{"name": "测试", "url": "http://test.com"}]
-        request.set_debug_envs(debug_envs)
         json_data = json.loads(request.build_json_data())
-        self.assertIn("apis", json_data)
-        self.assertIn("debugEnvs", json_data)
-        self.assertEqual(json_data["apis"], apis)
-        self.assertEqual(json_data["debugEnvs"], debug_envs)
+        self.assertEqual(json_data, {"apis": apis, "debugEnvs": debug_envs})
+    
+    def test_doc_push_json_data_apis_only(self):
+        """测试只设置 API 时不输出调试环境字段"""
+        apis = [{"name": "用户登录", "url": "/api/login"}]
+        request = DocPushRequest(self.token).set_apis(apis)
+        
+        self.assertEqual(json.loads(request.build_json_data()), {"apis": apis})
 
 
 class TestModuleGetRequest(BaseTest):
@@ -229,8 +324,8 @@ class TestModuleGetRequest(BaseTest):
         """测试模块信息请求创建"""
         request = ModuleGetRequest(self.token)
         
-        self.assertEqual(request.name(), "module.get")
-        self.assertEqual(request.version(), "1.0")
+        self.assertEqual(request.name, "module.get")
+        self.assertEqual(request.version, "1.0")
         self.assertEqual(request.token, self.token)
 
 
@@ -242,8 +337,8 @@ class TestDocDetailsRequest(BaseTest):
         doc_ids = ["doc1", "doc2", "doc3"]
         request = DocDetailsRequest(self.token, doc_ids)
         
-        self.assertEqual(request.name(), "doc.details")
-        self.assertEqual(request.version(), "1.0")
+        self.assertEqual(request.name, "doc.details")
+        self.assertEqual(request.version, "1.0")
         self.assertEqual(request.doc_ids, doc_ids)
     
     def test_doc_details_json_data(self):
@@ -255,7 +350,48 @@ class TestDocDetailsRequest(BaseTest):
         self.assertEqual(json_data["ids"], doc_ids)
 
 
-class TestTornaClient(BaseTest):
+class TestDocCategoryRequest(BaseTest):
+    """分类请求测试 - 分类名称不能覆盖接口名称"""
+    
+    def test_category_create_request(self):
+        """测试创建分类请求"""
+        request = DocCategoryCreateRequest(self.token, "用户管理")
+        
+        self.assertEqual(request.name, "doc.category.create")
+        self.assertEqual(request.category_name, "用户管理")
+        self.assertEqual(json.loads(request.build_json_data()), {"name": "用户管理"})
+    
+    def test_category_name_update_request(self):
+        """测试更新分类名称请求"""
+        request = DocCategoryNameUpdateRequest(self.token, "cat1", "订单管理")
+        
+        self.assertEqual(request.name, "doc.category.name.update")
+        self.assertEqual(json.loads(request.build_json_data()), {"id": "cat1", "name": "订单管理"})
+        self.assertEqual(request.create_request_form().get_form()["name"], "doc.category.name.update")
+
+
+class TestModuleDebugEnvRequest(BaseTest):
+    """调试环境请求测试 - 环境名称不能覆盖接口名称"""
+    
+    def test_debug_env_set_request(self):
+        """测试设置调试环境请求"""
+        request = ModuleDebugEnvSetRequest(self.token, "测试环境", "http://localhost:8080")
+        
+        self.assertEqual(request.name, "module.debug.env.set")
+        self.assertEqual(
+            json.loads(request.build_json_data()),
+            {"name": "测试环境", "url": "http://localhost:8080"}
+        )
+    
+    def test_debug_env_delete_request(self):
+        """测试删除调试环境请求"""
+        request = ModuleDebugEnvDeleteRequest(self.token, "测试环境")
+        
+        self.assertEqual(request.name, "module.debug.env.delete")
+        self.assertEqual(json.loads(request.build_json_data()), {"name": "测试环境"})
+
+
+class TestTornaClient(PatchedPostTest):
     """Torna 客户端测试"""
     
     def test_client_creation(self):
@@ -265,6 +401,18 @@ class TestTornaClient(BaseTest):
         self.assertEqual(client.token, self.token)
         self.assertIsNone(client.client)
     
+    def test_client_base_url_normalization(self):
+        """测试基础URL规范化"""
+        cases = {
+            "http://localhost:7700": "http://localhost:7700/api",
+            "http://localhost:7700/": "http://localhost:7700/api",
+            "http://localhost:7700/api/": "http://localhost:7700/api",
+            "http://localhost:7700/api/v1": "http://localhost:7700/api/v1",
+            "http://localhost:7700/apidoc": "http://localhost:7700/apidoc/api",
+        }
+        for base_url, expected in cases.items():
+            self.assertEqual(TornaClient(base_url, self.token).base_url, expected)
+    
     def test_client_context_manager(self):
         """测试客户端上下文管理器"""
         with TornaClient(self.base_url, self.token) as client:
@@ -272,21 +420,76 @@ class TestTornaClient(BaseTest):
         
         # 退出上下文管理器后客户端应该被关闭
         # 注意：这里不能直接测试client.client是否为None，因为对象已经销毁
-    
-    @patch('torna_mcp.refactored_client.httpx.Client.post')
-    def test_client_execution_success(self, mock_post):
+
+    def test_client_shares_connection_pool(self):
+        """测试多个客户端实例复用同一个连接池"""
+        with TornaClient(self.base_url, self.token) as first:
+            with TornaClient(self.base_url, "another-token") as second:
+                self.assertIs(first.client, second.client)
+            self.assertEqual(first.client.timeout.connect, TornaConfig.CONNECT_TIMEOUT)
+            self.assertEqual(first.client.timeout.pool, TornaConfig.POOL_TIMEOUT)
+
+    def test_client_execution_success(self):
         """测试客户端请求执行成功"""
-        mock_response = Mock()
-        mock_response.text = json.dumps(self.mock_success_response)
-        mock_response.raise_for_status = Mock()
-        mock_post.return_value = mock_response
+        self.post_response = SimpleNamespace(
+            content=self.mock_success_content,
+            raise_for_status=lambda: None
+        )
         
-        with TornaClient(self.base_url, self.token) as client:
-            request = DocListRequest(self.token)
-            response = client.execute(request)
+        request = DocListRequest(self.token)
+        response = self._client.execute(request)
         
         self.assertTrue(response.is_success())
-        mock_post.assert_called_once()
+        self.assertEqual(len(self.post_calls), 1)
+    
+    def test_client_execution_http_error(self):
+        """测试 HTTP 错误 - 响应体在访问 message 时才拼接"""
+        request = httpx.Request("POST", "http://localhost:7700/api")
+        self.post_response = httpx.Response(502, content=b"Bad Gateway", request=request)
+        
+        with self.assertRaises(TornaAPIError) as ctx:
+            self._client.execute(DocListRequest(self.token))
+        
+        error = ctx.exception
+        self.assertEqual(error.code, "HTTP_ERROR")
+        self.assertEqual(error.response.status_code, 502)
+        self.assertEqual(error.message, "HTTP请求失败: 502 - Bad Gateway")
+        self.assertEqual(str(error), "Torna API Error HTTP_ERROR: HTTP请求失败: 502 - Bad Gateway")
+    
+    def test_get_document_cache(self):
+        """测试重复获取同一文档时使用缓存，推送后缓存失效"""
+        self.post_response = SimpleNamespace(
+            content=encode_payload({"code": "0", "msg": "success", "data": {"id": "doc123"}}),
+            raise_for_status=lambda: None
+        )
+        
+        with TornaClient(self.base_url, self.token) as client:
+            first = client.get_document("doc123")
+            second = client.get_document("doc123")
+            self.assertEqual(first, second)
+            self.assertEqual(len(self.post_calls), 1)
+            
+            client.push_document({"name": "用户登录", "url": "/api/login"})
+            client.get_document("doc123")
+            self.assertEqual(len(self.post_calls), 3)
+    
+    def test_get_document_cache_isolation_and_eviction(self):
+        """测试修改返回结果不影响缓存，超过容量时淘汰最久未使用的文档"""
+        self.post_response = SimpleNamespace(
+            content=encode_payload({"code": "0", "msg": "success", "data": {"id": "doc123", "tags": ["a"]}}),
+            raise_for_status=lambda: None
+        )
+        
+        with patch.object(TornaConfig, "DOC_CACHE_SIZE", 2), TornaClient(self.base_url, self.token) as client:
+            first = client.get_document("doc1")
+            first["tags"].append("changed")
+            self.assertEqual(client.get_document("doc1")["tags"], ["a"])
+            
+            client.get_document("doc2")
+            client.get_document("doc1")  # doc1 变为最近使用
+            client.get_document("doc3")  # 淘汰 doc2
+            self.assertEqual(list(client._doc_cache), ["doc1", "doc3"])
+            self.assertEqual(len(self.post_calls), 3)
     
     def test_client_convenience_methods(self):
         """测试客户端便捷方法"""
@@ -300,6 +503,79 @@ class TestTornaClient(BaseTest):
             self.assertTrue(hasattr(client, 'get_batch_documents'))
 
 
+class TestAsyncTornaClient(BaseTest):
+    """异步 Torna 客户端测试"""
+    
+    @staticmethod
+    def make_response(url, **kwargs):
+        """按请求接口返回模拟的文档详情响应"""
+        form = json.loads(kwargs["content"])
+        data = json.loads(unquote(form["data"]))
+        if form["name"] == "doc.details":
+            # 故意倒序返回，验证按 id 分发结果
+            result = [{"id": doc_id} for doc_id in reversed(data["ids"])]
+        else:
+            result = {"id": data["id"]}
+        return SimpleNamespace(
+            content=encode_payload({"code": "0", "msg": "success", "data": result}),
+            raise_for_status=lambda: None
+        )
+    
+    @patch('torna_mcp.refactored_client.httpx.AsyncClient.post', new_callable=AsyncMock)
+    def test_get_documents_many(self, mock_post):
+        """测试并发获取多个文档详情合并为一次批量请求"""
+        mock_post.side_effect = self.make_response
+        
+        async def run():
+            async with AsyncTornaClient(self.base_url, self.token) as client:
+                return await client.get_documents_many(["doc1", "doc2", "doc3"])
+        
+        docs = asyncio.run(run())
+        
+        self.assertEqual([doc["id"] for doc in docs], ["doc1", "doc2", "doc3"])
+        self.assertEqual(mock_post.await_count, 1)
+        form = json.loads(mock_post.await_args.kwargs["content"])
+        self.assertEqual(form["name"], "doc.details")
+    
+    @patch('torna_mcp.refactored_client.httpx.AsyncClient.post', new_callable=AsyncMock)
+    def test_get_document_single(self, mock_post):
+        """测试单个文档请求仍使用 doc.detail 接口"""
+        mock_post.side_effect = self.make_response
+        
+        async def run():
+            async with AsyncTornaClient(self.base_url, self.token) as client:
+                return await client.get_document("doc1")
+        
+        doc = asyncio.run(run())
+        
+        self.assertEqual(doc["id"], "doc1")
+        form = json.loads(mock_post.await_args.kwargs["content"])
+        self.assertEqual(form["name"], "doc.detail")
+    
+    def test_doc_loader_survives_closed_loop(self):
+        """测试事件循环在合并窗口结束前关闭后，新事件循环中的加载不会卡住"""
+        fetched = []
+        
+        async def fetch_document(doc_id):
+            fetched.append(doc_id)
+            return {"id": doc_id}
+        
+        loader = _DocLoader(SimpleNamespace(_fetch_document=fetch_document))
+        
+        async def load_without_waiting():
+            loader.load("doc1")
+        
+        loop = asyncio.new_event_loop()
+        loop.run_until_complete(load_without_waiting())
+        loop.close()
+        
+        async def run():
+            return await asyncio.wait_for(loader.load("doc2"), timeout=1.0)
+        
+        self.assertEqual(asyncio.run(run()), {"id": "doc2"})
+        self.assertEqual(fetched, ["doc2"])
+
+
 class TestTornaConfig(unittest.TestCase):
     """Torna 配置常量测试"""
     
@@ -322,10 +598,17 @@ class TestRequestForm(unittest.TestCase):
         request_form = RequestForm(form_data)
         
         self.assertEqual(request_form.get_form(), form_data)
-        # 确保返回的是副本，不是原对象
-        self.assertIsNot(request_form.get_form(), form_data)
+        # 表单直接持有传入的字典，不做额外拷贝
+        self.assertIs(request_form.get_form(), form_data)
 
 
 if __name__ == '__main__':
-    # 运行所有测试
-    unittest.main(verbosity=2)
\ No newline at end of file
+    # 安装了 pytest-xdist 时按 CPU 核数并行运行，否则回退到 unittest 串行运行
+    try:
+        import pytest
+        import xdist  # noqa: F401
+    except ImportError:
+        unittest.main(verbosity=2)
+    else:
+        # 仓库的 pyproject.toml 中没有 pytest 配置，且目前无法解析，用空配置文件跳过它
+        sys.exit(pytest.main(["-c", os.devnull, "--rootdir", os.path.dirname(__file__), "-n", "auto", __file__]))
\ No newline at end of file
@@ -0,0 +1,373 @@
+"""
+Torna MCP Server (重构客户端版本) 测试套件
+
+服务端依赖的 torna_sdk 与仓库内的 torna_mcp.refactored_client 是同一套接口，
+每个测试中临时将后者注册为 torna_sdk，并以内存中的假客户端代替真实 HTTP 调用。
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from torna_mcp import refactored_client
+from torna_mcp import refactored_server as server
+from torna_mcp.refactored_client import TornaAPIError
+
+
+class FakeClient:
+    """假的 TornaClient - 按接口名返回预设数据，记录每次执行的请求"""
+
+    def __init__(self, handlers):
+        self.token = "test-token-123456"
+        self.handlers = handlers
+        self.requests = []
+
+    def execute(self, request):
+        self.requests.append(request)
+        result = self.handlers[request.name](request)
+        if isinstance(result, Exception):
+            raise result
+        response_class = type(request).response_class
+        return response_class.from_dict(result)
+
+
+def success(data):
+    """构建成功响应数据"""
+    return {"code": "0", "msg": "success", "data": data}
+
+
+class ServerTest(unittest.TestCase):
+    """服务端测试基类 - 每个测试使用独立的假客户端和空缓存"""
+
+    def setUp(self):
+        env = patch.dict(os.environ, {"TORNA_TOKEN": "test-token-123456"})
+        env.start()
+        self.addCleanup(env.stop)
+        sdk = patch.dict(sys.modules, {"torna_sdk": refactored_client})
+        sdk.start()
+        self.addCleanup(sdk.stop)
+        server._env.cache_clear()
+        self.addCleanup(server._env.cache_clear)
+
+        server._read_cache.clear()
+        self.addCleanup(server._read_cache.clear)
+        self.addCleanup(setattr, server, "_client", None)
+
+    def use_client(self, **handlers):
+        """以接口名 (点号换成下划线) 为键注册处理函数，返回安装好的假客户端"""
+        client = FakeClient({name.replace("_", "."): handler for name, handler in handlers.items()})
+        server._client = client
+        return client
+
+    def run_tool(self, tool, params):
+        return asyncio.run(tool(params))
+
+
+class TestToolErrors(ServerTest):
+    """工具错误处理测试"""
+
+    def test_missing_sdk_returns_error_message(self):
+        """未安装 torna_sdk 时工具返回错误信息而不是抛出异常"""
+        server._client = None
+        with patch.dict(sys.modules, {"torna_sdk": None}):
+            result = self.run_tool(server.torna_list_documents, server.DocListInput())
+            detail = self.run_tool(server.torna_get_document_detail, server.DocGetInput(doc_id="doc1"))
+
+        self.assertTrue(result.startswith("Configuration error:"), result)
+        self.assertIn("torna-sdk", result)
+        self.assertTrue(detail.startswith("Configuration error:"), detail)
+
+    def test_api_error_message(self):
+        """SDK 抛出的 TornaAPIError 格式化为错误信息"""
+        self.use_client(doc_detail=lambda request: TornaAPIError("HTTP_ERROR", "HTTP请求失败: 502"))
+
+        result = self.run_tool(server.torna_get_document_detail, server.DocGetInput(doc_id="doc1"))
+
+        self.assertEqual(result, "Torna API Error HTTP_ERROR: HTTP请求失败: 502")
+
+    def test_handler_without_sdk_module(self):
+        """错误处理本身不依赖 torna_sdk 已导入"""
+        with patch.dict(sys.modules, {"torna_sdk": None}):
+            message = server._handle_api_error_refactored(RuntimeError("boom"))
+
+        self.assertEqual(message, "Error: Unexpected error occurred: RuntimeError: boom")
+
+    def test_markdown_formatting_error(self):
+        """Markdown 格式化失败时返回错误信息，而不是看似成功的结果"""
+        self.use_client(module_get=lambda request: success({"name": "用户模块"}))
+
+        with patch.object(server, "_append_markdown", side_effect=ValueError("bad data")):
+            result = self.run_tool(server.torna_get_module_info, server.ModuleInfoInput())
+
+        self.assertEqual(result, "Error: Unexpected error occurred: ValueError: bad data")
+
+
+class TestSharedClient(ServerTest):
+    """共享客户端测试"""
+
+    @patch.object(refactored_client, "_SHARED_CLIENT", None)
+    @patch.object(refactored_client.httpx, "Client")
+    def test_client_uses_sdk_shared_pool(self, http_client):
+        """共享客户端通过 with 用法进入，使用 SDK 的共享连接池，关闭后释放"""
+        server._client = None
+        client = server._get_client()
+        self.addCleanup(server._close_client)
+
+        self.assertIs(server._get_client(), client)
+        self.assertEqual(client.token, "test-token-123456")
+        self.assertIs(client.client, http_client.return_value)
+        http_client.assert_called_once()
+        options = http_client.call_args.kwargs
+        self.assertEqual(options["timeout"].pool, refactored_client.TornaConfig.POOL_TIMEOUT)
+        self.assertGreaterEqual(options["limits"].max_connections, server.BATCH_DOC_CONCURRENCY)
+
+        server._close_client()
+        self.assertIsNone(server._client)
+        self.assertIsNone(client.client)
+
+
+class TestReadCache(ServerTest):
+    """只读请求缓存测试"""
+
+    def setUp(self):
+        super().setUp()
+        self.client = self.use_client(
+            doc_list=lambda request: success([{"id": "doc1", "name": "用户登录接口"}]),
+            doc_category_create=lambda request: success({"id": "cat1"}),
+        )
+
+    def list_documents(self):
+        return self.run_tool(server.torna_list_documents, server.DocListInput())
+
+    def create_category(self):
+        return self.run_tool(server.torna_create_category, server.DocCategoryCreateInput(name="用户管理"))
+
+    def test_cache_hit(self):
+        """TTL 内重复读取只请求一次"""
+        first = self.list_documents()
+        second = self.list_documents()
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.client.requests), 1)
+
+    def test_cache_expiry(self):
+        """缓存过期后重新请求"""
+        self.list_documents()
+        for key, (expires_at, response) in list(server._read_cache.items()):
+            server._read_cache[key] = (expires_at - server.READ_CACHE_TTL - 1, response)
+        self.list_documents()
+
+        self.assertEqual(len(self.client.requests), 2)
+
+    def test_write_invalidates_cache(self):
+        """写操作后缓存失效"""
+        self.list_documents()
+        self.create_category()
+        self.list_documents()
+
+        self.assertEqual([request.name for request in self.client.requests],
+                         ["doc.list", "doc.category.create", "doc.list"])
+
+    def test_inflight_read_not_cached_after_write(self):
+        """与写操作并发的读请求在缓存清空后才返回时，不写入缓存"""
+        release = threading.Event()
+
+        def slow_list(request):
+            release.wait(5)
+            return success([{"id": "doc1", "name": "旧数据"}])
+
+        self.client.handlers["doc.list"] = slow_list
+
+        async def scenario():
+            read = asyncio.create_task(server._execute_read(self.client, refactored_client.DocListRequest("t")))
+            await asyncio.sleep(0)
+            await server._execute_write(self.client, refactored_client.DocCategoryCreateRequest("t", "用户管理"))
+            release.set()
+            return await read
+
+        response = asyncio.run(scenario())
+
+        self.assertTrue(response.is_success())
+        self.assertEqual(server._read_cache, {})
+
+
+class TestPagination(ServerTest):
+    """列表结果分页测试"""
+
+    def setUp(self):
+        super().setUp()
+        docs = [{"id": f"doc{i}", "name": f"接口{i}"} for i in range(120)]
+        self.use_client(doc_list=lambda request: success(docs))
+
+    def list_documents(self, **kwargs):
+        params = server.DocListInput(response_format=server.ResponseFormat.JSON, **kwargs)
+        return json.loads(self.run_tool(server.torna_list_documents, params))
+
+    def test_default_limit(self):
+        """默认每页 50 条，并给出下一页起始位置"""
+        result = self.list_documents()
+
+        self.assertEqual(len(result["result"]), 50)
+        self.assertEqual(result["result"][0]["id"], "doc0")
+        self.assertEqual(result["next_offset"], 50)
+
+    def test_last_page(self):
+        """最后一页的 next_offset 为 null"""
+        result = self.list_documents(offset=100, limit=50)
+
+        self.assertEqual([doc["id"] for doc in result["result"]], [f"doc{i}" for i in range(100, 120)])
+        self.assertIsNone(result["next_offset"])
+
+    def test_markdown_next_page_hint(self):
+        """Markdown 输出在还有数据时提示下一页的 offset"""
+        output = self.run_tool(server.torna_list_documents, server.DocListInput(limit=10))
+
+        self.assertIn("### 接口9", output)
+        self.assertNotIn("### 接口10\n", output)
+        self.assertTrue(output.endswith("[More results available. Use offset=10 to continue.]"))
+
+    def test_non_paginated_tool(self):
+        """不分页的工具输出中没有 next_offset"""
+        self.use_client(doc_detail=lambda request: success({"id": request.doc_id, "name": "用户登录接口"}))
+        params = server.DocGetInput(doc_id="doc1", response_format=server.ResponseFormat.JSON)
+
+        result = json.loads(self.run_tool(server.torna_get_document_detail, params))
+
+        self.assertNotIn("next_offset", result)
+        self.assertEqual(result["result"]["id"], "doc1")
+
+
+class TestTruncation(unittest.TestCase):
+    """输出长度限制测试"""
+
+    def test_short_output_unchanged(self):
+        self.assertEqual(server._truncate("ok", True), "ok")
+
+    def test_paginated_notice(self):
+        """支持分页的工具提示使用 limit/offset"""
+        output = server._truncate("x" * (server.CHARACTER_LIMIT + 10), True)
+
+        self.assertTrue(output.startswith("x" * server.CHARACTER_LIMIT + "\n\n["))
+        self.assertIn("Use limit/offset", output)
+
+    def test_non_paginated_notice(self):
+        """不支持分页的工具不提示 limit/offset"""
+        data = {"id": "doc1", "content": "x" * server.CHARACTER_LIMIT}
+
+        output = server._format_markdown(data, "Document Detail")
+
+        self.assertTrue(output.endswith(f"[Output truncated at {server.CHARACTER_LIMIT} characters.]"))
+        self.assertNotIn("limit/offset", output)
+
+
+class TestFetchDocDetails(ServerTest):
+    """批量获取文档详情测试"""
+
+    def details(self, request):
+        return success([{"id": doc_id} for doc_id in request.doc_ids])
+
+    def test_single_request(self):
+        """ID 数量不超过一批时只发送一个请求"""
+        client = self.use_client(doc_details=self.details)
+        doc_ids = [f"doc{i}" for i in range(server.BATCH_DOC_CHUNK_SIZE)]
+
+        response = asyncio.run(server._fetch_doc_details(client, doc_ids))
+
+        self.assertEqual(len(client.requests), 1)
+        self.assertEqual([doc["id"] for doc in response.data], doc_ids)
+
+    def test_chunks_merged_in_order(self):
+        """超过一批时分批请求，并按输入顺序合并结果"""
+        client = self.use_client(doc_details=self.details)
+        doc_ids = tuple(f"doc{i}" for i in range(120))
+
+        response = asyncio.run(server._fetch_doc_details(client, doc_ids))
+
+        self.assertTrue(response.is_success())
+        self.assertEqual(sorted(len(request.doc_ids) for request in client.requests), [20, 50, 50])
+        self.assertEqual([doc["id"] for doc in response.data], list(doc_ids))
+
+    def test_first_failing_chunk_returned(self):
+        """任一批失败时返回第一个失败批次的响应"""
+        def details(request):
+            if "doc60" in request.doc_ids:
+                return {"code": "-1", "msg": "第二批失败", "data": None}
+            if "doc110" in request.doc_ids:
+                return {"code": "-2", "msg": "第三批失败", "data": None}
+            return self.details(request)
+
+        client = self.use_client(doc_details=details)
+
+        response = asyncio.run(server._fetch_doc_details(client, [f"doc{i}" for i in range(120)]))
+
+        self.assertFalse(response.is_success())
+        self.assertEqual((response.code, response.msg), ("-1", "第二批失败"))
+
+
+class TestPushData(ServerTest):
+    """文档推送数据构建测试"""
+
+    def test_minimal_push_data(self):
+        """未提供的参数列表不进入推送数据，布尔值转为 0/1 字符串"""
+        params = server.DocPushInput(name="用户登录", url="/api/login", http_method="post")
+
+        self.assertEqual(server._format_doc_push_data_refactored(params), [{
+            "name": "用户登录",
+            "description": "",
+            "url": "/api/login",
+            "httpMethod": "POST",
+            "contentType": "application/json",
+            "isFolder": "0",
+            "parentId": "",
+            "isShow": "1",
+        }])
+
+    def test_full_push_data(self):
+        """参数字段映射为 Torna 的键名，调试环境和作者不进入文档数据"""
+        params = server.DocPushInput(
+            name="用户登录",
+            description="登录接口",
+            url="/api/login",
+            http_method="POST",
+            is_folder=True,
+            parent_id="cat1",
+            is_show=False,
+            request_params=[{"name": "username"}],
+            header_params=[{"name": "token"}],
+            path_params=[],
+            query_params=[{"name": "lang"}],
+            response_params=[{"name": "userId"}],
+            error_codes=[{"code": "401"}],
+            debug_env_name="测试环境",
+            debug_env_url="http://localhost:8080",
+            author="张三",
+        )
+
+        self.assertEqual(server._format_doc_push_data_refactored(params), [{
+            "name": "用户登录",
+            "description": "登录接口",
+            "url": "/api/login",
+            "httpMethod": "POST",
+            "contentType": "application/json",
+            "isFolder": "1",
+            "parentId": "cat1",
+            "isShow": "0",
+            "requestParams": [{"name": "username"}],
+            "headerParams": [{"name": "token"}],
+            "queryParams": [{"name": "lang"}],
+            "responseParams": [{"name": "userId"}],
+            "errorCodeParams": [{"code": "401"}],
+        }])
+
+        request = server._build_push_request("t", params)
+        self.assertEqual(request.debug_envs, [{"name": "测试环境", "url": "http://localhost:8080"}])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)